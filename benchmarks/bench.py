@@ -0,0 +1,364 @@
+"""
+Offline load test for SprintBot.
+
+Starts local stand-ins for Zoho, Slack and OpenAI (see fake_upstreams.py),
+points the bot at them through its *_BASE_URL settings, runs the real app
+under uvicorn and drives /slack/events and/or /intent at a fixed
+concurrency. Reports p50/p99 latency, throughput and upstream calls per
+request, so a change can be compared before and after without network
+access:
+
+    python -m benchmarks.bench --items 5000 --requests 500 --concurrency 32
+    python -m benchmarks.bench --target intent --zoho-latency 150 --json out.json
+
+For /slack/events two latencies are reported: the HTTP acknowledgement and
+end to end, i.e. until the final reply reaches the fake Slack.
+
+Startup is reported too: the import time of sprint_bot.app in a fresh
+interpreter, and how long the server takes to answer /ready after it starts
+(compare with --no-warmup to see what the warm-up costs and saves).
+
+With --baseline, the run is checked against an earlier --json report and the
+process exits non-zero if any p99 latency or upstream calls-per-request figure
+regressed past its threshold, so the bench can gate CI:
+
+    python -m benchmarks.bench --json baseline.json
+    python -m benchmarks.bench --baseline baseline.json --max-p99-regression 0.25
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.fake_upstreams import DEFAULT_ZOHO_USER, FakeOpenAI, FakeSlack, FakeZoho, ServerThread
+
+# Phrases that miss the local fast path and go to the (fake) LLM or the intent cache
+LLM_PHRASES = [
+    "what am i working on this week",
+    "anything on my plate right now",
+    "which tasks are still open for me",
+    "remind me what i'm working on",
+]
+
+MESSAGE_KINDS = ("tickets", "help", "llm", "create", "delete")
+# Below these a difference is noise, whatever the relative threshold says
+P99_NOISE_MS = 2.0
+CALLS_NOISE = 0.01
+# /intent only serves these
+INTENT_KINDS = ("tickets", "llm", "delete")
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in MESSAGE_KINDS:
+            raise argparse.ArgumentTypeError(f"unknown message kind {kind!r}; expected one of {MESSAGE_KINDS}")
+        mix[kind] = int(weight or 1)
+    return mix
+
+
+def make_message(kind: str, n: int, seeded_items: int) -> str:
+    if kind == "tickets":
+        return "show me my tickets"
+    if kind == "help":
+        return "help"
+    if kind == "llm":
+        return LLM_PHRASES[n % len(LLM_PHRASES)]
+    if kind == "create":
+        return f'create a ticket called "bench ticket {n}"'
+    return f"delete ticket I{random.randint(1, max(1, seeded_items))}"
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(name: str, samples: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    return {
+        "name": name,
+        "requests": len(samples) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+class Bench:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.zoho = FakeZoho(items=args.items, users=args.users, latency_ms=args.zoho_latency)
+        self.slack = FakeSlack(latency_ms=args.slack_latency)
+        self.openai = FakeOpenAI(latency_ms=args.openai_latency)
+        self.servers: List[ServerThread] = []
+        self.bot_url: Optional[str] = None
+        self.ack_texts = set()
+        self.seq = itertools.count()
+        self.startup: Dict[str, object] = {}
+
+    def start(self):
+        zoho, slack, openai = (ServerThread(fake.app).start() for fake in (self.zoho, self.slack, self.openai))
+        self.servers += [zoho, slack, openai]
+        # The bot reads its configuration at import, so set it up first
+        os.environ.update({
+            "ZOHO_API_BASE_URL": f"{zoho.url}/zsapi",
+            "ZOHO_ACCESS_TOKEN": "bench",
+            "SLACK_API_BASE_URL": f"{slack.url}/api",
+            "SLACK_BOT_TOKEN": "bench",
+            "OPENAI_BASE_URL": f"{openai.url}/v1",
+            "OPENAI_API_KEY": "bench",
+            "SPRINTBOT_IDENTITY_FILE": os.path.join(tempfile.mkdtemp(prefix="sprintbot-bench-"), "identities.json"),
+            "LOG_LEVEL": self.args.log_level,
+            "WARMUP_ON_STARTUP": "0" if self.args.no_warmup else "1",
+            "WARMUP_TICKETS": "1" if self.args.warm_tickets else "0",
+        })
+        self.startup["import_s"] = self.measure_import()
+        from sprint_bot import app as bot
+
+        self.ack_texts = set(bot.ACK_MESSAGES.values())
+        start = time.perf_counter()
+        bot_server = ServerThread(bot.app).start()
+        self.startup["serving_s"] = round(time.perf_counter() - start, 3)
+        self.servers.append(bot_server)
+        self.bot_url = bot_server.url
+        self.startup.update(self.wait_until_ready(start))
+
+    @staticmethod
+    def measure_import() -> float:
+        # In a fresh interpreter: this process already has fastapi etc. loaded for the fakes
+        code = "import time; start = time.perf_counter(); import sprint_bot.app; print(time.perf_counter() - start)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=os.environ.copy())
+        if result.returncode != 0:
+            return float("nan")
+        return round(float(result.stdout.strip().splitlines()[-1]), 3)
+
+    def wait_until_ready(self, start: float, timeout: float = 60.0) -> Dict[str, object]:
+        deadline = start + timeout
+        with httpx.Client(base_url=self.bot_url) as client:
+            while time.perf_counter() < deadline:
+                response = client.get("/ready")
+                if response.status_code == 200:
+                    return {"ready_s": round(time.perf_counter() - start, 3), "warmup": response.json()}
+                time.sleep(0.01)
+        return {"ready_s": None, "warmup": None}
+
+    def stop(self):
+        for server in reversed(self.servers):
+            server.stop()
+
+    def upstream_calls(self) -> Counter:
+        calls = Counter()
+        for prefix, fake in (("zoho", self.zoho), ("slack", self.slack), ("openai", self.openai)):
+            for key, count in fake.calls.items():
+                calls[f"{prefix} {key}"] += count
+        return calls
+
+    async def wait_for_reply(self, channel: str, timeout: float) -> Optional[float]:
+        # The fake Slack runs on another thread; poll for the first non-ack message
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            for arrived, _, text in self.slack.by_channel.get(channel, ()):
+                if text not in self.ack_texts:
+                    return arrived
+            await asyncio.sleep(0.005)
+        return None
+
+    async def slack_request(self, client: httpx.AsyncClient, kind: str, results: Dict[str, list]):
+        n = next(self.seq)
+        channel = f"BENCH{n}"
+        payload = {
+            "event_id": f"Ev{n}-{random.random()}",
+            "team_id": "TBENCH",
+            "event": {"type": "message", "user": f"SU{n % self.args.users}", "channel": channel, "text": make_message(kind, n, self.args.items)},
+        }
+        start = time.perf_counter()
+        try:
+            response = await client.post("/slack/events", json=payload)
+        except httpx.HTTPError:
+            results["slack_ack_errors"].append(1)
+            return
+        results["slack_ack"].append(time.perf_counter() - start)
+        if response.status_code != 200:
+            results["slack_ack_errors"].append(1)
+            return
+        arrived = await self.wait_for_reply(channel, self.args.reply_timeout)
+        if arrived is None:
+            results["slack_e2e_errors"].append(1)
+        else:
+            results["slack_e2e"].append(arrived - start)
+
+    async def intent_request(self, client: httpx.AsyncClient, kind: str, results: Dict[str, list]):
+        n = next(self.seq)
+        start = time.perf_counter()
+        try:
+            response = await client.post("/intent", json={"message": make_message(kind, n, self.args.items), "user_id": DEFAULT_ZOHO_USER})
+        except httpx.HTTPError:
+            results["intent_errors"].append(1)
+            return
+        if response.status_code >= 500:
+            results["intent_errors"].append(1)
+        else:
+            results["intent"].append(time.perf_counter() - start)
+
+    async def run_phase(self, requests: int) -> Dict[str, list]:
+        args = self.args
+        targets = ["slack", "intent"] if args.target == "both" else [args.target]
+        plan = []
+        for i in range(requests):
+            target = targets[i % len(targets)]
+            mix = args.mix if target == "slack" else {k: w for k, w in args.mix.items() if k in INTENT_KINDS}
+            plan.append((target, random.choices(list(mix), weights=list(mix.values()))[0]))
+        results: Dict[str, list] = {key: [] for key in ("slack_ack", "slack_ack_errors", "slack_e2e", "slack_e2e_errors", "intent", "intent_errors")}
+        queue = iter(plan)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=self.bot_url, timeout=args.reply_timeout, limits=limits) as client:
+            async def worker():
+                for target, kind in queue:
+                    if target == "slack":
+                        await self.slack_request(client, kind, results)
+                    else:
+                        await self.intent_request(client, kind, results)
+
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        return results
+
+    async def run(self) -> Dict[str, object]:
+        args = self.args
+        if args.warmup_requests:
+            await self.run_phase(args.warmup_requests)
+        # Let warm-up replies land before taking the upstream baseline
+        await asyncio.sleep(0.5)
+        before = self.upstream_calls()
+        start = time.perf_counter()
+        results = await self.run_phase(args.requests)
+        elapsed = time.perf_counter() - start
+        await asyncio.sleep(0.5)
+        calls = self.upstream_calls() - before
+
+        report = {
+            "config": {k: v for k, v in vars(args).items() if k not in ("json", "baseline")},
+            "startup": self.startup,
+            "elapsed_s": round(elapsed, 3),
+            "latency": [],
+        }
+        if results["slack_ack"] or results["slack_ack_errors"]:
+            report["latency"].append(summarize("slack_events ack", results["slack_ack"], len(results["slack_ack_errors"]), elapsed))
+            report["latency"].append(summarize("slack_events end-to-end", results["slack_e2e"], len(results["slack_e2e_errors"]), elapsed))
+        if results["intent"] or results["intent_errors"]:
+            report["latency"].append(summarize("intent", results["intent"], len(results["intent_errors"]), elapsed))
+        report["upstream_calls"] = dict(sorted(calls.items()))
+        report["upstream_calls_per_request"] = {key: round(count / args.requests, 3) for key, count in sorted(calls.items())}
+        async with httpx.AsyncClient(base_url=self.bot_url) as client:
+            report["bot_stats"] = (await client.get("/stats")).json()
+        return report
+
+
+def print_report(report: Dict[str, object]):
+    print(f"\n{report['config']['requests']} requests at concurrency {report['config']['concurrency']} "
+          f"({report['config']['items']} items, {report['elapsed_s']}s)\n")
+    startup = report["startup"]
+    print(f"startup: import {startup['import_s']}s, serving {startup['serving_s']}s, ready {startup['ready_s']}s"
+          f" (warm-up {(startup['warmup'] or {}).get('state')})\n")
+    print(f"{'endpoint':<26}{'reqs':>7}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for row in report["latency"]:
+        print(f"{row['name']:<26}{row['requests']:>7}{row['errors']:>8}{row['throughput_rps']:>10}{row['p50_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}")
+    print("\nupstream calls per request:")
+    for key, value in report["upstream_calls_per_request"].items():
+        print(f"  {key:<32}{value:>8}  ({report['upstream_calls'][key]} total)")
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], max_p99: float, max_calls: float) -> List[str]:
+    """
+    Regressions of ``report`` against ``baseline`` (both --json reports): a
+    p99 more than ``max_p99`` (a fraction) above the baseline row of the same
+    name, or upstream calls per request more than ``max_calls`` above.
+    Rows or upstream calls missing from the baseline count from zero.
+    """
+    regressions = []
+    base_p99 = {row["name"]: row["p99_ms"] for row in baseline.get("latency", [])}
+    for row in report["latency"]:
+        base = base_p99.get(row["name"])
+        if base is None:
+            continue
+        if row["p99_ms"] > base * (1 + max_p99) + P99_NOISE_MS:
+            regressions.append(f"{row['name']} p99 {row['p99_ms']} ms vs {base} ms in the baseline")
+    base_calls = baseline.get("upstream_calls_per_request", {})
+    for key, value in report["upstream_calls_per_request"].items():
+        base = base_calls.get(key, 0.0)
+        if value > base * (1 + max_calls) + CALLS_NOISE:
+            regressions.append(f"{key}: {value} calls per request vs {base} in the baseline")
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("slack", "intent", "both"), default="both")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--warmup-requests", type=int, default=20,
+                        help="unmeasured requests sent before the run (the bot's own startup warm-up is --no-warmup)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--items", type=int, default=1000, help="tickets in the fake sprint (100 to 10000)")
+    parser.add_argument("--users", type=int, default=20, help="users in the fake sprint")
+    parser.add_argument("--zoho-latency", type=float, default=80.0, help="mean Zoho latency in ms")
+    parser.add_argument("--slack-latency", type=float, default=40.0, help="mean Slack latency in ms")
+    parser.add_argument("--openai-latency", type=float, default=400.0, help="mean OpenAI latency in ms")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("tickets=5,help=1,llm=2,create=1,delete=1"),
+                        help=f"weighted message kinds, e.g. tickets=5,llm=2 (kinds: {', '.join(MESSAGE_KINDS)})")
+    parser.add_argument("--reply-timeout", type=float, default=60.0, help="seconds to wait for a Slack reply")
+    parser.add_argument("--no-warmup", action="store_true", help="start the bot cold (WARMUP_ON_STARTUP=0)")
+    parser.add_argument("--warm-tickets", action="store_true", help="also load the ticket store during warm-up")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--baseline", help="--json report to compare against; exits non-zero on a regression")
+    parser.add_argument("--max-p99-regression", type=float, default=0.2,
+                        help="allowed p99 increase over the baseline, as a fraction (default 0.2)")
+    parser.add_argument("--max-calls-regression", type=float, default=0.1,
+                        help="allowed increase in upstream calls per request, as a fraction (default 0.1)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+    bench = Bench(args)
+    bench.start()
+    try:
+        report = asyncio.run(bench.run())
+    finally:
+        bench.stop()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.max_p99_regression, args.max_calls_regression)
+        if regressions:
+            print(f"\nregressions against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nno regressions against {args.baseline}")
+    return report
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
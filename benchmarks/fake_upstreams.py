@@ -0,0 +1,251 @@
+"""
+Local stand-ins for the services SprintBot talks to: the Zoho Sprints
+endpoints it uses, Slack's chat.postMessage / users.info / auth.test and OpenAI's chat
+completions. Each is a small FastAPI app with configurable latency that
+counts every call, so a benchmark can report upstream calls per request.
+"""
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Row layout the bot parses (see sprint_bot.models.ITEM_SCHEMA)
+ROW_LENGTH = 32
+TITLE, ITEM_NO, CREATED_BY, STATUS, ASSIGNEES = 0, 1, 2, 26, 31
+
+# Zoho user the bench acts as: Slack users link to it by name ("Bench Owner")
+# and /intent requests pass it as user_id, so "my tickets" has something to return
+DEFAULT_ZOHO_USER = "28091000000403001"
+
+
+class Latency:
+    """Mean delay with +/- ``jitter`` fraction, in seconds."""
+
+    def __init__(self, mean_ms: float, jitter: float = 0.2):
+        self.mean = mean_ms / 1000
+        self.jitter = jitter
+
+    async def wait(self):
+        if self.mean > 0:
+            await asyncio.sleep(self.mean * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+class FakeZoho:
+    """A single sprint of ``items`` tickets spread over ``users`` users."""
+
+    def __init__(self, items: int = 1000, users: int = 20, latency_ms: float = 80.0):
+        self.latency = Latency(latency_ms)
+        self.calls: Counter = Counter()
+        self.users = {DEFAULT_ZOHO_USER: "Bench Owner"}
+        for n in range(1, users):
+            self.users[f"U{n}"] = f"Bench User {n}"
+        self.user_ids = list(self.users)
+        self.statuses = {"ST1": "To do", "ST2": "In progress", "ST3": "Done"}
+        self.items: Dict[str, list] = {}
+        self.modified: Dict[str, float] = {}
+        self.next_item_no = 1
+        for _ in range(items):
+            self._add(f"Seeded ticket {self.next_item_no}", [random.choice(self.user_ids)])
+        self.app = self._build_app()
+
+    def _add(self, title: str, assignees: List[str]) -> tuple:
+        item_no = self.next_item_no
+        self.next_item_no += 1
+        item_id = f"ID{item_no}"
+        row = [None] * ROW_LENGTH
+        row[TITLE] = title
+        row[ITEM_NO] = str(item_no)
+        row[CREATED_BY] = random.choice(self.user_ids)
+        row[STATUS] = random.choice(list(self.statuses))
+        row[ASSIGNEES] = assignees
+        self.items[item_id] = row
+        self.modified[item_id] = time.time()
+        return item_id, item_no
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def count_and_delay(request: Request, call_next):
+            # Bucket by the last meaningful path segment: sprints, users, itemstatus, item
+            segments = [s for s in request.url.path.split("/") if s]
+            kind = next((s for s in reversed(segments) if s in ("sprints", "users", "itemstatus", "item")), "other")
+            self.calls[f"{request.method} {kind}"] += 1
+            await self.latency.wait()
+            return await call_next(request)
+
+        @app.get("/zsapi/team/{team}/projects/{project}/sprints/")
+        async def sprints(team: str, project: str):
+            return {"sprintIds": ["S1"]}
+
+        @app.get("/zsapi/team/{team}/projects/{project}/sprints/{sprint}/users/")
+        async def users(team: str, project: str, sprint: str):
+            return {"userJObj": {user_id: [name] for user_id, name in self.users.items()}}
+
+        @app.get("/zsapi/team/{team}/projects/{project}/itemstatus/")
+        async def itemstatus(team: str, project: str):
+            return {"statusJObj": {status_id: [name] for status_id, name in self.statuses.items()}}
+
+        @app.get("/zsapi/team/{team}/projects/{project}/sprints/{sprint}/item/")
+        async def list_items(request: Request, team: str, project: str, sprint: str, index: int = 1, range: int = 100):
+            since = request.query_params.get("modifiedafter")
+            ids = list(self.items)
+            if since is not None:
+                cutoff = int(since) / 1000
+                ids = [item_id for item_id in ids if self.modified[item_id] >= cutoff]
+            page = ids[index - 1:index - 1 + range]
+            return {
+                "itemJObj": {item_id: self.items[item_id] for item_id in page},
+                "userDisplayName": self.users,
+                "next": index - 1 + range < len(ids),
+            }
+
+        @app.post("/zsapi/team/{team}/projects/{project}/sprints/{sprint}/item/")
+        async def create_item(request: Request, team: str, project: str, sprint: str):
+            # Form-encoded like the real API; parsed by hand to avoid python-multipart
+            form = {key: values[0] for key, values in parse_qs((await request.body()).decode()).items()}
+            assignees = json.loads(form.get("users") or "[]")
+            item_id, item_no = self._add(form.get("name", "Untitled"), assignees)
+            return {"itemId": item_id, "itemNo": f"I{item_no}", "statusId": self.items[item_id][STATUS]}
+
+        @app.delete("/zsapi/team/{team}/projects/{project}/sprints/{sprint}/item/{item_id}/")
+        async def delete_item(team: str, project: str, sprint: str, item_id: str):
+            if self.items.pop(item_id, None) is None:
+                return JSONResponse({"error": "not found"}, status_code=404)
+            self.modified.pop(item_id, None)
+            return {}
+
+        return app
+
+
+class FakeSlack:
+    """Records every posted message with its arrival time."""
+
+    def __init__(self, latency_ms: float = 40.0, names: Optional[Dict[str, str]] = None):
+        self.latency = Latency(latency_ms)
+        self.calls: Counter = Counter()
+        self.names = names or {}
+        self.messages: List[tuple] = []
+        self.by_channel: Dict[str, List[tuple]] = {}
+        self.app = self._build_app()
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.post("/api/chat.postMessage")
+        async def post_message(request: Request):
+            self.calls["chat.postMessage"] += 1
+            await self.latency.wait()
+            body = await request.json()
+            message = (time.perf_counter(), body.get("channel"), body.get("text", ""))
+            self.messages.append(message)
+            self.by_channel.setdefault(message[1], []).append(message)
+            return {"ok": True, "channel": body.get("channel"), "ts": f"{time.time():.6f}"}
+
+        @app.post("/api/auth.test")
+        async def auth_test():
+            self.calls["auth.test"] += 1
+            await self.latency.wait()
+            return {"ok": True, "user_id": "UBENCHBOT"}
+
+        @app.get("/api/users.info")
+        async def users_info(user: str):
+            self.calls["users.info"] += 1
+            await self.latency.wait()
+            return {"ok": True, "user": {"id": user, "real_name": self.names.get(user, "Bench Owner")}}
+
+        return app
+
+
+# Keyword rules standing in for the model: enough to give each benchmark
+# message the answer the real model would
+_QUOTED = re.compile(r"[\"']([^\"']+)[\"']")
+_TICKET = re.compile(r"\bI?(\d+)\b", re.IGNORECASE)
+
+
+def _classify(query: str) -> dict:
+    lowered = query.lower()
+    if "delete" in lowered or "remove" in lowered:
+        match = _TICKET.search(query)
+        return {"intent": "delete_ticket", "ticket_id": f"I{match.group(1)}"} if match else {"intent": "delete_ticket"}
+    if "create" in lowered or "add" in lowered or "new" in lowered:
+        match = _QUOTED.search(query)
+        title = match.group(1) if match else query.rsplit("-", 1)[-1].strip()
+        return {"intent": "create_ticket", "title": title, "assignee": "me"}
+    if "help" in lowered or "can you" in lowered:
+        return {"intent": "bot_capabilities"}
+    if "ticket" in lowered or "task" in lowered or "plate" in lowered or "working on" in lowered:
+        return {"intent": "get_my_tickets"}
+    return {"intent": "unknown"}
+
+
+class FakeOpenAI:
+    def __init__(self, latency_ms: float = 400.0):
+        self.latency = Latency(latency_ms)
+        self.calls: Counter = Counter()
+        self.app = self._build_app()
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.post("/v1/chat/completions")
+        async def completions(request: Request):
+            self.calls["chat.completions"] += 1
+            await self.latency.wait()
+            body = await request.json()
+            prompt = body["messages"][-1]["content"]
+            query = prompt.rsplit("User:", 1)[-1].strip()
+            return {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "bench"),
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": json.dumps(_classify(query))},
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }
+
+        return app
+
+
+class ServerThread:
+    """Runs an ASGI app under uvicorn on its own thread and event loop."""
+
+    def __init__(self, app, port: int = 0, host: str = "127.0.0.1"):
+        config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.host = host
+
+    def start(self, timeout: float = 30.0) -> "ServerThread":
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError("Server failed to start")
+            time.sleep(0.01)
+        return self
+
+    @property
+    def port(self) -> int:
+        return self.server.servers[0].sockets[0].getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
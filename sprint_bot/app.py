@@ -1,16 +1,59 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Body
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-import requests
 import json
 from loguru import logger
-from cachetools import TTLCache
 import asyncio
 import os
-from sprint_bot.helpers import format_tickets_response, get_bot_capabilities_message
-from sprint_bot.intent_recognition import detect_intent
-
-app = FastAPI()
+from sprint_bot.dedup import create_dedup_store
+from sprint_bot.event_pipeline import EventPipeline, SlackEvent
+from sprint_bot.helpers import format_bulk_summary, format_tickets_response, get_bot_capabilities_message
+from sprint_bot.identity import IdentityIndex
+from sprint_bot.intent_cache import intent_cache
+from sprint_bot.intent_recognition import BULK_MAX_ITEMS, aclose_openai_client, detect_intent, openai_policy, warm_openai_client
+from sprint_bot.metrics import metrics
+from sprint_bot.models import Ticket
+from sprint_bot.slack_client import slack_sender
+from sprint_bot.sync_engine import NO_ACTIVE_SPRINT
+from sprint_bot.task_scheduler import TaskScheduler
+from sprint_bot.tenants import TenantRegistry
+from sprint_bot.ticket_store import normalize_item_no
+from sprint_bot.tracing import Trace, current_trace, preview, setup_logging, span, use_trace
+from sprint_bot.warmup import WARMUP_TICKETS, Warmup
+from sprint_bot.webhooks import ZOHO_WEBHOOK_SIGNATURE_HEADER, apply_events, iter_events, verify_signature
+from sprint_bot.zoho_client import ZohoAPIError
+
+setup_logging()
+
+# Zoho writes in flight at once for a single bulk request
+BULK_CONCURRENCY = int(os.environ.get("BULK_CONCURRENCY", "4"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await intent_scheduler.start()
+    await event_pipeline.start()
+    tenants.start()
+    # Reference data, connection pools and the OpenAI client load in the
+    # background; /ready reports when they're done
+    for tenant in tenants:
+        warmup.add(f"zoho.{tenant.name}", lambda tenant=tenant: tenant.warm_up(tickets=WARMUP_TICKETS and tenant is tenants.default))
+    warmup.add("slack", slack_sender.warm_up)
+    warmup.add("openai", warm_openai_client)
+    warmup.start()
+    yield
+    await warmup.aclose()
+    # Finish queued Slack events and the intent jobs they submitted, stop
+    # pending background refreshes and release the pooled HTTP connections
+    await event_pipeline.stop()
+    await intent_scheduler.stop()
+    await tenants.aclose()
+    await slack_sender.aclose()
+    await aclose_openai_client()
+    await event_dedup.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,192 +63,226 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-event_cache = TTLCache(maxsize=1000, ttl=600)
-
-# Slack and Zoho Sprints credentials
-SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
-ZOHO_ACCESS_TOKEN = os.environ.get("ZOHO_ACCESS_TOKEN")
-ZOHO_API_BASE_URL = "https://sprintsapi.zoho.com/zsapi"
-
+# Slack event ids already accepted; per-process by default, shared between workers with DEDUP_BACKEND=sqlite or redis
+event_dedup = create_dedup_store()
 
-def get_current_sprint():
-    # Call Zoho Sprints API to fetch the current sprint
-    logger.info(f"Fetching current sprint")
-    response = requests.get(
-        f"{ZOHO_API_BASE_URL}/team/669462816/projects/28091000000003109/sprints/",
-        params={"action": "data", "index": 1, "range": 100, "type": "[2]"},
-        headers={"Authorization": f"Bearer {ZOHO_ACCESS_TOKEN}"},
-    )
-    if response.status_code == 200:
-        data = response.json()
-        logger.info(f"Data: {data}")
-        sprint_ids = data.get("sprintIds", [])
-        if sprint_ids:
-            return sprint_ids[0]  # Return the first sprint ID
-        else:
-            logger.info("No active sprints found.")
-            return None
-    else:
-        logger.error(f"Failed to fetch sprints. Status code: {response.status_code}, Response: {response.text}")
-        return None
+# Zoho teams/projects served by this deployment
+tenants = TenantRegistry.from_env()
+# Learned Slack user -> Zoho user links, persisted across restarts
+identities = IdentityIndex()
+# Startup cache/pool warm-up, reported by /ready
+warmup = Warmup()
 
-def fetch_sprint_users():
-    # Call Zoho Sprints API to fetch users in the current sprint
-    logger.info(f"Fetching sprint users")
-    team_id = "669462816"  # Replace with actual team ID
-    sprint_id = get_current_sprint()
 
-    response = requests.get(
-        f"{ZOHO_API_BASE_URL}/team/{team_id}/projects/28091000000003109/sprints/{sprint_id}/users/",
-        params={"action": "data", "index": 1, "range": 100},
-        headers={"Authorization": f"Bearer {ZOHO_ACCESS_TOKEN}"},
-    )
-    # With the response, create a dictionary of user IDs and their display names
-    if response.status_code == 200:
-        data = response.json()
-        logger.info(f"Data: {data}")
-        users = data.get("userJObj", {})
-        user_display_names = {}
-        for user_id, user_info in users.items():
-            user_display_names[user_id] = user_info[0]
-        return user_display_names
-    else:
-        logger.error(f"Failed to fetch sprint users. Status code: {response.status_code}, Response: {response.text}")
-        return None
-
-def get_all_status():
-    # Call Zoho Sprints API to fetch all status
-    logger.info(f"Fetching all status")
-    response = requests.get(
-        f"{ZOHO_API_BASE_URL}/team/669462816/projects/28091000000003109/itemstatus/",
-        params={"action": "data", "index": 1, "range": 100},
-        headers={"Authorization": f"Bearer {ZOHO_ACCESS_TOKEN}"},
-    )
-    if response.status_code == 200:
-        data = response.json()
-        logger.info(f"Data: {data}")
-        statuses = {}
-        for status_id, status_info in data.get("statusJObj", {}).items():
-            statuses[status_id] = status_info[0]  # status name is at index 0
-        return statuses
-    else:
-        logger.error(f"Failed to fetch status. Status code: {response.status_code}, Response: {response.text}")
-        return {}
+async def resolve_zoho_user(tenant, slack_user_id):
+    """
+    Map a Slack user to the tenant's Zoho user: configured links first, then
+    links learned earlier, then a one-off match of the Slack profile against
+    the sprint roster. None if nothing matches: an unlinked user is never
+    mapped to someone else (e.g. the tenant's default user).
+
+    A learned link is permanent, so only an email match or an exact
+    (normalized) name match is remembered; a fuzzy one could silently make
+    "Rob Jones" act as Bob Jones.
+    """
+    if slack_user_id in tenant.config.users:
+        return tenant.config.users[slack_user_id]
+    zoho_user_id = identities.get(tenant.name, slack_user_id)
+    if zoho_user_id:
+        return zoho_user_id
+    if slack_user_id:
+        profile = await slack_sender.user_profile(slack_user_id)
+        if profile:
+            # Loading the roster also refreshes the tenant's email map
+            name_index = await tenant.user_index()
+            zoho_user_id = tenant.user_for_email(profile["email"])
+            if not zoho_user_id and profile["real_name"]:
+                zoho_user_id = name_index.exact(profile["real_name"])
+            if zoho_user_id:
+                logger.info(f"[{tenant.name}] Linked Slack user {slack_user_id} to Zoho user {zoho_user_id}")
+                await identities.link(tenant.name, slack_user_id, zoho_user_id)
+                return zoho_user_id
+    return None
 
 
-def get_all_tickets():
-    # Call Zoho Sprints API to fetch tickets assigned to the user
-    team_id = "669462816"  # Replace with actual user ID
-    sprint_id = get_current_sprint()
-    sprint_users = fetch_sprint_users()
-    statuses = get_all_status()
-    print(sprint_users)
-    logger.info(f"Fetching tickets for user")
-    response = requests.get(
-        f"{ZOHO_API_BASE_URL}/team/{team_id}/projects/28091000000003109/sprints/{sprint_id}/item/",
-        params={"action": "data", "index": 1, "range": 100},
-        headers={"Authorization": f"Bearer {ZOHO_ACCESS_TOKEN}"},
-    )
-    if response.status_code == 200:
-        data = response.json()
-        # logger.info(f"Data: {data}")
-        tickets = data.get("itemJObj", {})
-        user_display_names = data.get("userDisplayName", {})
-
-        if tickets:
-            raw_data = {
-                "count": len(tickets),
-                "tickets": []
-            }
-            for ticket_id, ticket_info in tickets.items():
-                ticket = {
-                    "id": ticket_id,
-                    "title": ticket_info[0],
-                    "item_no": ticket_info[1],
-                    "status": statuses.get(ticket_info[26], "Unknown"),
-                    "created_by": user_display_names.get(ticket_info[2], "Unknown"),
-                    # assigned_to is now a dict: {user_id: user_display_name, ...}
-                    "assigned_to": {user_id: user_display_names.get(user_id, "Unknown") for user_id in ticket_info[31]},
-                }
-                raw_data["tickets"].append(ticket)
-
-            return raw_data
-        else:
-            logger.info("No tickets found.")
-            return {"message": "No tickets found."}
-    else:
-        logger.error(f"Failed to fetch tickets. Status code: {response.status_code}, Response: {response.text}")
-        return {"message": "Failed to fetch tickets."}
-
-def get_tickets_for_user(user_id):
+async def get_tickets_for_user(tenant, user_id):
     """
-    Returns tickets assigned to the given user_id.
+    Returns Ticket records assigned to the given Zoho user_id.
     """
-    all_tickets_data = get_all_tickets()
-    if not all_tickets_data or "tickets" not in all_tickets_data:
-        return {"count": 0, "tickets": []}
-
-    filtered_tickets = []
-    for ticket in all_tickets_data["tickets"]:
-        # assigned_to is now a dict: {user_id: user_display_name, ...}
-        if user_id in ticket.get("assigned_to", {}):
-            filtered_tickets.append(ticket)
+    try:
+        store = await tenant.sprint_sync.ensure_fresh()
+    except ZohoAPIError:
+        return {"count": 0, "tickets": [], "error": "Failed to fetch tickets."}
 
+    filtered_tickets = store.for_assignee(user_id)
     return {
         "count": len(filtered_tickets),
         "tickets": filtered_tickets
     }
 
 @app.get("/test")
-async def test():
-    # tickets = get_all_tickets()
-    # Example usage for filtering by user_id:
-    tickets = get_tickets_for_user("28091000000403001")
+async def test(tenant: str = None):
+    # Example usage for filtering by the tenant's default user:
+    tenant = tenants.get(tenant)
+    if tenant is None:
+        return JSONResponse(content={"error": "Unknown tenant"}, status_code=404)
+    if not tenant.config.default_zoho_user:
+        return JSONResponse(content={"error": "ZOHO_DEFAULT_USER is not set"}, status_code=400)
+    tickets = await get_tickets_for_user(tenant, tenant.config.default_zoho_user)
+    tickets["tickets"] = [ticket.to_dict() for ticket in tickets["tickets"]]
     return JSONResponse(content=tickets)
 
-def send_slack_message(channel, text):
-    response = requests.post(
-        "https://slack.com/api/chat.postMessage",
-        headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"},
-        json={"channel": channel, "text": text},
-    )
-    logger.info(f"Slack API response: {response.text}")
+async def send_slack_message(channel, text, ack=None):
+    # Pass the PendingAck for this request so a not-yet-sent ack is replaced.
+    # Long replies arrive as a list of chunks, sent in order.
+    if isinstance(text, str):
+        return await slack_sender.send(channel, text, ack=ack)
+    delivered = True
+    for index, chunk in enumerate(text):
+        delivered = await slack_sender.send(channel, chunk, ack=ack if index == 0 else None) and delivered
+    return delivered
+
+
+UNKNOWN_REQUEST_MESSAGE = "❓ Sorry, I couldn't understand your request. Please rephrase or try another command."
+UNLINKED_USER_MESSAGE = (
+    "❌ Your Slack account isn't linked to a Zoho user, so I can't tell which tickets are yours. "
+    "Please ask an admin to add you to the tenant's user map."
+)
+
+
+def needs_zoho_user(intent_result) -> bool:
+    # Intents that act as the sender: their tickets, or a create assigned to them
+    intent = intent_result.get("intent")
+    if intent == "get_my_tickets":
+        return True
+    if intent in ("create_ticket", "bulk_create_tickets"):
+        return intent_result.get("assignee") in (None, "", "me")
+    return False
+
+# Acknowledgement sent before running each intent
+ACK_MESSAGES = {
+    "get_my_tickets": "🔍 Working on your request...",
+    "create_ticket": "📝 Creating your ticket...",
+    "bot_capabilities": "ℹ️ Listing my capabilities...",
+    "delete_ticket": "🗑️ Deleting your ticket...",
+    "bulk_create_tickets": "📝 Creating your tickets...",
+    "bulk_delete_tickets": "🗑️ Deleting your tickets...",
+}
 
 
 # Background task to process and send ticket results
-async def handle_intent_in_background(user_id, channel, intent_result):
+async def handle_intent_in_background(tenant, user_id, channel, intent_result, ack=None):
     final_message = "❌ Something went wrong while processing your request."
     try:
         if intent_result["intent"] == "get_my_tickets":
-            tickets = get_tickets_for_user(user_id)
-            if not tickets or not tickets.get("tickets"):
+            tickets = await get_tickets_for_user(tenant, user_id)
+            if tickets.get("error"):
+                final_message = "❌ I couldn't reach Zoho to fetch your tickets. Please try again shortly."
+            elif not tickets.get("tickets"):
                 final_message = "No tickets found assigned to you."
             else:
                 final_message = format_tickets_response(tickets["tickets"])
         elif intent_result["intent"] == "create_ticket":
-            final_message = create_ticket(
+            final_message = await create_ticket(
+                tenant,
                 title=intent_result.get("title", "Untitled Ticket"),
                 assignee_name=intent_result.get("assignee"),
                 user_id=user_id
             )
         elif intent_result["intent"] == "delete_ticket":
             ticket_id = intent_result.get("ticket_id")
-            final_message = delete_ticket(ticket_id)
+            final_message = await delete_ticket(tenant, ticket_id)
+        elif intent_result["intent"] == "bulk_create_tickets":
+            final_message = await bulk_create_tickets(
+                tenant,
+                titles=intent_result.get("titles", []),
+                assignee_name=intent_result.get("assignee"),
+                user_id=user_id
+            )
+        elif intent_result["intent"] == "bulk_delete_tickets":
+            final_message = await bulk_delete_tickets(tenant, intent_result.get("ticket_ids", []), intent_result.get("ticket_count"))
         elif intent_result["intent"] == "bot_capabilities":
             final_message = get_bot_capabilities_message()
         else:
-            final_message = "❓ Sorry, I couldn't understand your request. Please rephrase or try another command."
+            final_message = UNKNOWN_REQUEST_MESSAGE
     except Exception as e:
         logger.exception("Error handling intent in background")
         final_message = "❌ Something went wrong while processing your request."
-    send_slack_message(channel, final_message)
+    await send_slack_message(channel, final_message, ack=ack)
+
+async def process_slack_event(event: SlackEvent):
+    """
+    Worker side of the event pipeline: classify, acknowledge, then execute.
+    The event's trace is finished here unless a job was handed to the
+    intent scheduler, in which case the job finishes it.
+    """
+    handed_off = False
+    try:
+        handed_off = await _process_slack_event(event)
+    finally:
+        if not handed_off and event.trace is not None:
+            event.trace.finish()
+
+async def _process_slack_event(event: SlackEvent) -> bool:
+    tenant = tenants.resolve(event.slack_team_id, event.channel)
+    user_id = await resolve_zoho_user(tenant, event.user_id)
+    logger.info(f"[{tenant.name}] Handling message from user {event.user_id} ({user_id}): {preview(event.text)}")
+
+    with event_pipeline.stage("classify"):
+        intent_result = await detect_intent(event.text)
+    logger.info(f"Detected intent: {intent_result}")
+
+    intent = intent_result.get("intent") if intent_result else None
+    if intent not in ACK_MESSAGES:
+        with event_pipeline.stage("ack"):
+            await send_slack_message(event.channel, UNKNOWN_REQUEST_MESSAGE)
+        return False
+    if intent == "delete_ticket" and not intent_result.get("ticket_id"):
+        with event_pipeline.stage("ack"):
+            await send_slack_message(event.channel, "❌ Ticket ID is required to delete a ticket.")
+        return False
+    if user_id is None and needs_zoho_user(intent_result):
+        logger.info(f"[{tenant.name}] Slack user {event.user_id} isn't linked to a Zoho user")
+        with event_pipeline.stage("ack"):
+            await send_slack_message(event.channel, UNLINKED_USER_MESSAGE)
+        return False
+
+    # The ack is delayed briefly and dropped if the result beats it
+    with event_pipeline.stage("ack"):
+        ack = slack_sender.ack(event.channel, ACK_MESSAGES[intent])
+
+    async def run():
+        # Runs in this event's context (see TaskScheduler), so spans land on its trace
+        try:
+            with span(f"execute.{intent}"):
+                await handle_intent_in_background(tenant, user_id, event.channel, intent_result, ack=ack)
+        finally:
+            trace = current_trace()
+            if trace is not None:
+                trace.finish()
+
+    async def on_failure(error):
+        if isinstance(error, asyncio.TimeoutError):
+            await send_slack_message(event.channel, "⏱️ Sorry, that took too long. Please try again in a moment.", ack=ack)
+        else:
+            await send_slack_message(event.channel, "❌ Something went wrong while processing your request.", ack=ack)
+
+    # Execution runs on the intent scheduler so pipeline workers stay free
+    if not intent_scheduler.submit(intent, run, on_failure=on_failure):
+        await send_slack_message(event.channel, "🚦 I'm handling a lot of requests right now. Please try again shortly.", ack=ack)
+        return False
+    return True
+
+
+event_pipeline = EventPipeline(process_slack_event)
+intent_scheduler = TaskScheduler()
 
 # Endpoint to handle Slack events
 
 @app.post("/slack/events")
 async def slack_events(request: Request):
     data = await request.json()
-    logger.info(f"Received Slack event: {data}")
+    logger.opt(lazy=True).debug("Received Slack event: {}", lambda: preview(data))
 
     # Handle Slack URL verification (important to do before event cache check)
     if "challenge" in data:
@@ -221,162 +298,397 @@ async def slack_events(request: Request):
         and not event.get("bot_id")  # Ignore messages sent by bots (including this bot)
     ):
         unique_event_id = event_id or event.get("event_ts")
-        if unique_event_id in event_cache:
+        # Atomic check-and-set, so a retry landing on another worker is dropped too
+        if unique_event_id and not await event_dedup.claim(unique_event_id):
             logger.info(f"Duplicate event detected: {unique_event_id}")
+            metrics.incr("sprintbot_duplicate_events_total")
             return JSONResponse(content={"status": "ok"}, status_code=200)
 
-        event_cache[unique_event_id] = True
-
-        user_message = event.get("text", "").lower()
-        user_id = event.get("user")
-        user_id = "28091000000403001"
-        channel = event.get("channel")
-
-        logger.info(f"Handling message from user {user_id}: {user_message}")
-
-        intent_result = detect_intent(user_message)
-        logger.info(f"Detected intent: {intent_result}")
-
-        if intent_result:
-            if intent_result["intent"] == "get_my_tickets":
-                send_slack_message(channel, "🔍 Working on your request...")
-                asyncio.create_task(handle_intent_in_background(user_id, channel, intent_result))
-            elif intent_result["intent"] == "create_ticket":
-                send_slack_message(channel, "📝 Creating your ticket...")
-                asyncio.create_task(handle_intent_in_background(user_id, channel, intent_result))
-            elif intent_result["intent"] == "bot_capabilities":
-                send_slack_message(channel, "ℹ️ Listing my capabilities...")
-                asyncio.create_task(handle_intent_in_background(user_id, channel, intent_result))
-            elif intent_result["intent"] == "delete_ticket":
-                ticket_id = intent_result.get("ticket_id")
-                if not ticket_id:
-                    send_slack_message(channel, "❌ Ticket ID is required to delete a ticket.")
-                else:
-                    send_slack_message(channel, "🗑️ Deleting your ticket...")
-                    asyncio.create_task(handle_intent_in_background(user_id, channel, intent_result))
-            else:
-                send_slack_message(channel, "❓ Sorry, I couldn't understand your request. Please rephrase or try another command.")
-        else:
-            send_slack_message(channel, "❓ Sorry, I couldn't understand your request. Please rephrase or try another command.")
+        slack_event = SlackEvent(
+            event_id=unique_event_id,
+            user_id=event.get("user"),
+            slack_team_id=data.get("team_id") or event.get("team"),
+            channel=event.get("channel"),
+            text=event.get("text", "").lower(),
+            trace=Trace(),
+        )
+        logger.info(f"Event {unique_event_id} is trace {slack_event.trace.trace_id}")
+        # Classification and replies happen on the pipeline workers; just enqueue
+        if not event_pipeline.submit(slack_event):
+            # Queue is full: forget the event so Slack's retry is accepted later
+            if unique_event_id:
+                await event_dedup.release(unique_event_id)
+            metrics.incr("sprintbot_rejected_events_total")
+            return JSONResponse(content={"status": "busy"}, status_code=503)
 
     return JSONResponse(content={"status": "ok"})
 
+# Endpoint to receive Zoho Sprints change notifications
+
+@app.post("/zoho/webhook")
+async def zoho_webhook(request: Request, tenant: str = None):
+    """Apply pushed item/sprint changes to the tenant's caches instead of waiting for the next poll."""
+    target = tenants.get(tenant)
+    if target is None:
+        return JSONResponse(content={"error": f"Unknown tenant {tenant!r}"}, status_code=404)
+    if not target.webhook_secret:
+        logger.warning(f"[{target.name}] Zoho webhook received but {target.config.webhook_secret_env} is not set")
+        return JSONResponse(content={"error": "Webhooks are not configured"}, status_code=503)
+
+    # The signature covers the raw bytes, so verify before parsing
+    body = await request.body()
+    if not verify_signature(target.webhook_secret, body, request.headers.get(ZOHO_WEBHOOK_SIGNATURE_HEADER)):
+        metrics.incr("sprintbot_webhook_rejected_total", tenant=target.name)
+        return JSONResponse(content={"error": "Invalid signature"}, status_code=401)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return JSONResponse(content={"error": "Invalid JSON"}, status_code=400)
+    if not isinstance(payload, dict):
+        return JSONResponse(content={"error": "Expected a JSON object"}, status_code=400)
+    if not all(isinstance(event, dict) for event in iter_events(payload)):
+        return JSONResponse(content={"error": "Expected every event to be a JSON object"}, status_code=400)
+    logger.opt(lazy=True).debug("Received Zoho webhook: {}", lambda: preview(payload))
+
+    outcomes = apply_events(target, payload)
+    for outcome, count in outcomes.items():
+        metrics.incr("sprintbot_webhook_events_total", count, tenant=target.name, outcome=outcome)
+    return JSONResponse(content={"status": "ok", "applied": outcomes})
+
+@app.get("/stats")
+async def stats():
+    return JSONResponse(content={
+        "event_pipeline": event_pipeline.stats(),
+        "intent_scheduler": intent_scheduler.stats(),
+        "tenants": tenants.stats(),
+        "intent_cache": intent_cache.stats(),
+        "slack": slack_sender.stats(),
+        "dedup": event_dedup.stats(),
+        "warmup": warmup.stats(),
+        "upstreams": {policy.display: policy.stats() for policy in _upstream_policies()},
+    })
+
+def _upstream_policies():
+    # One Zoho policy per tenant, one for OpenAI
+    return [tenant.zoho.policy for tenant in tenants] + [openai_policy]
+
+@app.get("/ready")
+async def ready():
+    """Readiness for the load balancer: 503 until the startup warm-up has finished."""
+    return JSONResponse(content=warmup.stats(), status_code=200 if warmup.ready else 503)
+
+def _collect_gauges():
+    # Read at scrape time from the components that already keep these counts
+    yield "sprintbot_event_queue_depth", {}, event_pipeline.depth()
+    yield "sprintbot_intent_queue_depth", {}, intent_scheduler.queued()
+    yield "sprintbot_intent_jobs_running", {}, intent_scheduler.running
+    yield "sprintbot_intent_jobs_timed_out", {}, intent_scheduler.timed_out
+    yield "sprintbot_intent_jobs_failed", {}, intent_scheduler.failed
+    cache = intent_cache.stats()
+    yield "sprintbot_cache_hits", {"cache": "intent"}, cache["hits"]
+    yield "sprintbot_cache_misses", {"cache": "intent"}, cache["misses"]
+    yield "sprintbot_cache_hit_ratio", {"cache": "intent"}, round(cache["hit_rate"], 4)
+    for tenant in tenants:
+        reference = tenant.reference_cache.stats()
+        lookups = reference["hits"] + reference["misses"]
+        yield "sprintbot_cache_hits", {"cache": "reference", "tenant": tenant.name}, reference["hits"]
+        yield "sprintbot_cache_misses", {"cache": "reference", "tenant": tenant.name}, reference["misses"]
+        yield "sprintbot_cache_hit_ratio", {"cache": "reference", "tenant": tenant.name}, round(reference["hits"] / lookups, 4) if lookups else 0.0
+        sync = tenant.sprint_sync
+        yield "sprintbot_tickets", {"tenant": tenant.name}, len(tenant.ticket_store)
+        yield "sprintbot_sync_failures", {"tenant": tenant.name}, sync.failures
+        if sync.last_sync is not None:
+            yield "sprintbot_sync_staleness_seconds", {"tenant": tenant.name}, round(sync.staleness(), 3)
+    for policy in _upstream_policies():
+        for endpoint, upstream in policy.stats()["endpoints"].items():
+            # 0 closed, 1 half-open, 2 open
+            state = {"closed": 0, "half_open": 1, "open": 2}[upstream["state"]]
+            yield "sprintbot_circuit_state", {"upstream": policy.name, **policy.labels, "endpoint": endpoint}, state
+    yield "sprintbot_ready", {}, int(warmup.ready)
+    if warmup.seconds is not None:
+        yield "sprintbot_warmup_seconds", {}, warmup.seconds
+    slack = slack_sender.stats()
+    for key in ("sent", "failed", "retries", "rate_limited", "coalesced_acks"):
+        yield f"sprintbot_slack_{key}", {}, slack[key]
+
+
+metrics.register_collector(_collect_gauges)
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text format: span latency histograms, error counters, cache and queue gauges."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.post("/intent")
 async def intent_router(payload: dict = Body(...)):
     """
     Accepts a JSON payload with a 'message' key, detects intent, and calls the respective function.
+    Optional 'tenant' and 'user_id' (Zoho user) keys pick who the request runs as.
     Example payload: {"message": "Show me my tickets"}
+    The response carries the request's trace id in X-Trace-Id.
     """
+    trace = Trace()
+    with use_trace(trace):
+        try:
+            response = await _route_intent(payload)
+        finally:
+            trace.finish()
+    response.headers["X-Trace-Id"] = trace.trace_id
+    return response
+
+async def _route_intent(payload):
     message = payload.get("message", "")
     if not message:
         return JSONResponse(content={"error": "No message provided"}, status_code=400)
+    tenant = tenants.get(payload.get("tenant"))
+    if tenant is None:
+        return JSONResponse(content={"error": "Unknown tenant"}, status_code=404)
+    user_id = payload.get("user_id")
 
-    intent = detect_intent(message)
+    with span("classify"):
+        intent = await detect_intent(message)
     logger.info(f"Detected intent: {intent}")
+    if intent and not user_id and needs_zoho_user(intent):
+        return JSONResponse(content={"error": "user_id is required for this request"}, status_code=400)
 
-    if intent == "get_my_tickets":
-        tickets = get_tickets_for_user("28091000000403001")
+    if intent and intent.get("intent") == "get_my_tickets":
+        tickets = await get_tickets_for_user(tenant, user_id)
+        tickets["tickets"] = [ticket.to_dict() for ticket in tickets["tickets"]]
         return JSONResponse(content=tickets)
     elif intent and intent.get("intent") == "delete_ticket":
         ticket_id = intent.get("ticket_id")
-        result = delete_ticket(ticket_id)
+        result = await delete_ticket(tenant, ticket_id)
+        return JSONResponse(content={"result": result})
+    elif intent and intent.get("intent") == "bulk_create_tickets":
+        result = await bulk_create_tickets(tenant, intent.get("titles", []), intent.get("assignee"), user_id=user_id)
+        return JSONResponse(content={"result": result})
+    elif intent and intent.get("intent") == "bulk_delete_tickets":
+        result = await bulk_delete_tickets(tenant, intent.get("ticket_ids", []), intent.get("ticket_count"))
         return JSONResponse(content={"result": result})
     else:
         return JSONResponse(content={"error": "Intent not recognized or not supported."}, status_code=400)
 
-def get_user_id_by_name(name, sprint_users):
-    # Simple case-insensitive match for user display name
-    for user_id, display_name in sprint_users.items():
-        if display_name.lower() == name.lower():
-            return user_id
-    return None
-
-def create_ticket(title, assignee_name=None, user_id=None):
-    team_id = "669462816"
-    project_id = "28091000000003109"
-    sprint_id = get_current_sprint()
-    sprint_users = fetch_sprint_users()
-    # Default item type and priority (should be dynamic/configurable)
-    projitemtypeid = "28091000000003133"
-    projpriorityid = "28091000000003121"
+async def resolve_assignee(tenant, name):
+    """
+    Resolve a typed assignee name ("Al", "alice s.", "Alice") against the
+    sprint roster. Returns (user_id, ranked matches); user_id is None when
+    nothing or more than one user plausibly matches.
+    """
+    name_index = await tenant.user_index()
+    return name_index.resolve(name)
 
-    # Determine assignee user_id
+async def _resolve_assignee_id(tenant, assignee_name, user_id):
+    # Returns (assignee_id, error_message); error_message is set when the name can't be used
     if assignee_name == "me" and user_id:
-        assignee_id = user_id
-    elif assignee_name:
-        assignee_id = get_user_id_by_name(assignee_name, sprint_users)
-    else:
-        assignee_id = user_id
-
-    users = [assignee_id] if assignee_id else []
+        return user_id, None
+    if not assignee_name:
+        return user_id, None
+    assignee_id, matches = await resolve_assignee(tenant, assignee_name)
+    if assignee_id:
+        return assignee_id, None
+    if matches:
+        options = ", ".join(name for _, name, _ in matches)
+        return None, f"❓ `{assignee_name}` matches more than one person ({options}). Please be more specific."
+    return None, f"❌ I couldn't find anyone called `{assignee_name}` in this sprint."
+
+def _sprint_error(sprint_id):
+    # One reply for the whole request when there's no sprint to write to
+    if sprint_id is None:
+        return "❌ I couldn't reach Zoho to look up the current sprint. Please try again shortly."
+    if sprint_id == NO_ACTIVE_SPRINT:
+        return "❌ There's no active sprint right now."
+    return None
 
+async def _create_item(tenant, sprint_id, title, users, created_by=None):
+    """
+    POST one item to Zoho and index it. Returns the response data ({} if it
+    couldn't be parsed), or None if Zoho refused the create.
+    """
     payload = {
         "name": title,
-        "projitemtypeid": projitemtypeid,
-        "projpriorityid": projpriorityid,
+        # Default item type and priority come from the tenant config
+        "projitemtypeid": tenant.config.item_type_id,
+        "projpriorityid": tenant.config.priority_id,
         "users": json.dumps(users),  # Ensure this is a JSON array string
         "description": ""
     }
-    logger.info(f"Creating ticket with payload: {payload}")
-    response = requests.post(
-        f"{ZOHO_API_BASE_URL}/team/{team_id}/projects/{project_id}/sprints/{sprint_id}/item/",
-        headers={"Authorization": f"Zoho-oauthtoken {ZOHO_ACCESS_TOKEN}"},
+    logger.opt(lazy=True).debug("Creating ticket with payload: {}", lambda: preview(payload))
+    response = await tenant.zoho.post(
+        tenant.sprint_items_path(sprint_id),
         data=payload,
+        auth_scheme="Zoho-oauthtoken",
     )
-    if response.status_code in (200, 201):
-        try:
-            data = response.json()
-            item_no = data.get("itemNo")
-            if item_no:
-                ticket_url = f"https://sprints.zoho.com/workspace/decisiontree#P2/itemdetails/{item_no}"
-                final_message = f"✅ Ticket created successfully!\nTicket No: `{item_no}`\nURL: {ticket_url}"
-            else:
-                final_message = "✅ Ticket created, but could not fetch ticket ID."
-        except Exception:
-            final_message = "✅ Ticket created, but failed to parse response."
-    else:
-        logger.error(f"Failed to create ticket: {response.text}")
-        final_message = "❌ Failed to create the ticket. Please try again."
-    return final_message
-
-def delete_ticket(item_no: str) -> str:
-    team_id = "669462816"
-    project_id = "28091000000003109"
-    sprint_id = get_current_sprint()
+    if response.status_code not in (200, 201):
+        logger.error(f"Failed to create ticket: {preview(response.text)}")
+        return None
+    try:
+        data = response.json()
+    except ValueError:
+        logger.error(f"Ticket created but the response wasn't JSON: {preview(response.text)}")
+        tenant.sprint_sync.mark_stale()
+        return {}
+    await _record_created_ticket(tenant, data, title, users, created_by=created_by)
+    return data
+
+async def create_ticket(tenant, title, assignee_name=None, user_id=None):
+    sprint_id = await tenant.current_sprint()
+    sprint_error = _sprint_error(sprint_id)
+    if sprint_error:
+        return sprint_error
+    assignee_id, error = await _resolve_assignee_id(tenant, assignee_name, user_id)
+    if error:
+        return error
+    users = [assignee_id] if assignee_id else []
+
+    data = await _create_item(tenant, sprint_id, title, users, created_by=user_id)
+    if data is None:
+        return "❌ Failed to create the ticket. Please try again."
+    item_no = data.get("itemNo")
+    if not item_no:
+        return "✅ Ticket created, but could not fetch ticket ID."
+    ticket_url = tenant.ticket_url(item_no)
+    return f"✅ Ticket created successfully!\nTicket No: `{item_no}`\nURL: {ticket_url}"
+
+async def bulk_create_tickets(tenant, titles, assignee_name=None, user_id=None):
+    """
+    Create every title in one go: the sprint and assignee are resolved once,
+    the Zoho writes run BULK_CONCURRENCY at a time, and a single summary
+    with a line per ticket is returned.
+    """
+    if not titles:
+        return "❌ I couldn't find any ticket titles in your request."
+    if len(titles) > BULK_MAX_ITEMS:
+        return f"❌ That's {len(titles)} tickets; I can create at most {BULK_MAX_ITEMS} per request."
+    sprint_id, (assignee_id, error) = await asyncio.gather(
+        tenant.current_sprint(), _resolve_assignee_id(tenant, assignee_name, user_id)
+    )
+    sprint_error = _sprint_error(sprint_id)
+    if sprint_error:
+        return sprint_error
+    if error:
+        return error
+    users = [assignee_id] if assignee_id else []
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+
+    async def create_one(title):
+        async with semaphore:
+            try:
+                data = await _create_item(tenant, sprint_id, title, users, created_by=user_id)
+            except Exception:
+                logger.exception(f"Failed to create ticket {title!r}")
+                data = None
+        if data is None:
+            return title, False, "failed"
+        item_no = data.get("itemNo")
+        return title, True, f"`{item_no}` {tenant.ticket_url(item_no)}" if item_no else "created"
+
+    results = await asyncio.gather(*(create_one(title) for title in titles))
+    return format_bulk_summary("Created", results)
+
+async def _record_created_ticket(tenant, data, title, users, created_by=None):
+    # Patch the ticket store with a freshly created item instead of reloading the sprint
+    ticket_store = tenant.ticket_store
+    item_id = data.get("itemId")
+    if not item_id or not data.get("itemNo"):
+        # Not enough in the response to index it; sync on next read
+        tenant.sprint_sync.mark_stale()
+        return
+    ticket_store.directory.update_users(await tenant.sprint_users())
+    ticket_store.upsert(Ticket(
+        id=item_id,
+        title=title,
+        item_no=normalize_item_no(data["itemNo"]),
+        status_id=data.get("statusId"),
+        created_by_id=created_by,
+        assignee_ids=tuple(users),
+        directory=ticket_store.directory,
+    ))
+
+async def _delete_item(tenant, sprint_id, ticket_id) -> bool:
+    path = f"{tenant.sprint_items_path(sprint_id)}{ticket_id}/"
+    response = await tenant.zoho.delete(path, auth_scheme="Zoho-oauthtoken")
+    if response.status_code in (200, 204):
+        tenant.ticket_store.remove(ticket_id)
+        return True
+    logger.error(f"Failed to delete ticket: {preview(response.text)}")
+    return False
+
+async def delete_ticket(tenant, item_no: str) -> str:
     # Get the ticket ID from the item_no
-    ticket_id = get_ticket_id_by_item_no(item_no)
+    sprint_id, ticket_id = await asyncio.gather(tenant.current_sprint(), get_ticket_id_by_item_no(tenant, item_no))
+    sprint_error = _sprint_error(sprint_id)
+    if sprint_error:
+        return sprint_error
     if not ticket_id:
         logger.error(f"Ticket with item_no {item_no} not found.")
         return f"❌ Ticket with item_no `{item_no}` not found. Please check the ID and try again."
-    url = f"{ZOHO_API_BASE_URL}/team/{team_id}/projects/{project_id}/sprints/{sprint_id}/item/{ticket_id}/"
-    headers = {"Authorization": f"Zoho-oauthtoken {ZOHO_ACCESS_TOKEN}"}
-    response = requests.delete(url, headers=headers)
-    if response.status_code in (200, 204):
+    if await _delete_item(tenant, sprint_id, ticket_id):
         return f"✅ Ticket `{item_no}` deleted successfully."
     else:
-        logger.error(f"Failed to delete ticket: {response.text}")
         return f"❌ Failed to delete ticket `{item_no}`. Please check the ID and try again."
 
-def get_ticket_id_by_item_no(item_no: str) -> str:
+async def bulk_delete_tickets(tenant, item_nos, count=None):
+    """
+    Delete every item_no in one go: ids are looked up in a single pass over
+    the ticket store, the Zoho deletes run BULK_CONCURRENCY at a time, and a
+    single summary with a line per ticket is returned. ``count`` is the real
+    number of ids asked for when ``item_nos`` was cut off at the limit.
+    """
+    if not item_nos:
+        return "❌ I couldn't find any ticket IDs in your request."
+    count = max(count or 0, len(item_nos))
+    if count > BULK_MAX_ITEMS:
+        return f"❌ That's {count} tickets; I can delete at most {BULK_MAX_ITEMS} per request."
+    sprint_id, ticket_ids = await asyncio.gather(tenant.current_sprint(), get_ticket_ids_by_item_no(tenant, item_nos))
+    sprint_error = _sprint_error(sprint_id)
+    if sprint_error:
+        return sprint_error
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+
+    async def delete_one(item_no):
+        ticket_id = ticket_ids.get(item_no)
+        if not ticket_id:
+            return f"`{item_no}`", False, "not found"
+        async with semaphore:
+            try:
+                deleted = await _delete_item(tenant, sprint_id, ticket_id)
+            except Exception:
+                logger.exception(f"Failed to delete ticket {item_no}")
+                deleted = False
+        return f"`{item_no}`", deleted, "deleted" if deleted else "failed"
+
+    results = await asyncio.gather(*(delete_one(item_no) for item_no in item_nos))
+    return format_bulk_summary("Deleted", results)
+
+async def get_ticket_ids_by_item_no(tenant, item_nos):
+    """
+    Map each item_no (user-facing ticket number) to its internal ticket ID,
+    or None if not found. Syncs at most once, however many are missing.
+    """
+    # The store strips the 'I' prefix Zoho item numbers are shown with
+    found = dict.fromkeys(item_nos)
+    try:
+        store = await tenant.sprint_sync.ensure_fresh()
+        found = {item_no: store.id_for_item_no(item_no) for item_no in item_nos}
+        if not all(found.values()):
+            # Possibly created outside the bot since the last sync; pull the delta and retry
+            await tenant.sprint_sync.sync()
+            found = {item_no: ticket_id or store.id_for_item_no(item_no) for item_no, ticket_id in found.items()}
+    except ZohoAPIError:
+        pass
+    return found
+
+async def get_ticket_id_by_item_no(tenant, item_no: str) -> str:
     """
     Given an item_no (user-facing ticket number), return the internal ticket ID.
     Returns None if not found.
     """
-    all_tickets = get_all_tickets()
-    if not all_tickets or "tickets" not in all_tickets:
-        return None
-    # item_no is prefixed with 'I' in Zoho, so we need to match it by removing 'I' if present
-    if item_no.upper().startswith('I'):
-        item_no = item_no[1:]  # Remove 'I' prefix for matching
-    item_no = item_no.strip()  # Clean up any extra spaces
-    if not item_no:
+    if not item_no or not normalize_item_no(item_no):
         logger.error("No item_no provided for ticket search.")
         return None
     logger.info(f"Searching for ticket with item_no: {item_no}")
-    for ticket in all_tickets["tickets"]:
-        if str(ticket.get("item_no")) == str(item_no):
-            return ticket.get("id")
-    return None
+    return (await get_ticket_ids_by_item_no(tenant, [item_no]))[item_no]
 
 # Start the FastAPI server
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+import abc
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+# "memory" (per process), "sqlite" (shared by every worker on a host) or "redis" (shared across hosts)
+DEDUP_BACKEND = os.environ.get("DEDUP_BACKEND", "memory")
+# Slack retries a delivery up to three times over a few minutes
+DEDUP_TTL = float(os.environ.get("DEDUP_TTL", "600"))
+# Peak Slack events per second we expect; sizes the in-memory store so ids
+# aren't evicted before their TTL (which would let a retry through)
+DEDUP_EVENT_RATE = float(os.environ.get("DEDUP_EVENT_RATE", "20"))
+DEDUP_HEADROOM = float(os.environ.get("DEDUP_HEADROOM", "2"))
+DEDUP_SQLITE_PATH = os.environ.get("DEDUP_SQLITE_PATH", "sprintbot_events.db")
+DEDUP_REDIS_URL = os.environ.get("DEDUP_REDIS_URL", "redis://localhost:6379/0")
+DEDUP_REDIS_PREFIX = os.environ.get("DEDUP_REDIS_PREFIX", "sprintbot:event:")
+
+
+def capacity_for(rate: float = DEDUP_EVENT_RATE, ttl: float = DEDUP_TTL, headroom: float = DEDUP_HEADROOM) -> int:
+    # Ids alive at once at the peak rate, with headroom for bursts
+    return max(1000, int(rate * ttl * headroom))
+
+
+class DedupStore(abc.ABC):
+    """
+    Remembers Slack event ids for ``ttl`` seconds.
+
+    ``claim`` is an atomic check-and-set: it returns True for exactly one
+    caller per event id (within the TTL), however many processes share the
+    backend. ``release`` forgets an id so a later retry is accepted, e.g.
+    when the event was claimed but couldn't be queued.
+    """
+
+    backend = "base"
+
+    def __init__(self, ttl: float = DEDUP_TTL):
+        self.ttl = ttl
+        self.claimed = 0
+        self.duplicates = 0
+
+    async def claim(self, event_id: str) -> bool:
+        first = await self._claim(event_id)
+        if first:
+            self.claimed += 1
+        else:
+            self.duplicates += 1
+        return first
+
+    @abc.abstractmethod
+    async def _claim(self, event_id: str) -> bool:
+        ...
+
+    @abc.abstractmethod
+    async def release(self, event_id: str):
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "claimed": self.claimed, "duplicates": self.duplicates}
+
+    async def aclose(self):
+        pass
+
+
+class MemoryDedupStore(DedupStore):
+    """Per-process store; enough for a single uvicorn worker."""
+
+    backend = "memory"
+
+    def __init__(self, ttl: float = DEDUP_TTL, maxsize: Optional[int] = None):
+        super().__init__(ttl)
+        self.maxsize = maxsize or capacity_for(ttl=ttl)
+        self._seen = TTLCache(maxsize=self.maxsize, ttl=ttl)
+
+    async def _claim(self, event_id: str) -> bool:
+        # No await between the check and the set, so this is atomic on the event loop
+        if event_id in self._seen:
+            return False
+        self._seen[event_id] = True
+        return True
+
+    async def release(self, event_id: str):
+        self._seen.pop(event_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "size": len(self._seen), "capacity": self.maxsize}
+
+
+class SQLiteDedupStore(DedupStore):
+    """
+    Store shared by every process on a host through one SQLite file (WAL
+    mode). The claim is a single upsert that only succeeds for a new or
+    expired id, so two workers racing on a Slack retry can't both win.
+    Expired rows are purged every ``purge_every`` claims. The row count shown
+    by ``stats`` is refreshed from the claim thread at most every
+    ``count_every`` seconds, so ``/stats`` never touches the database.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = DEDUP_SQLITE_PATH, ttl: float = DEDUP_TTL, purge_every: int = 1000, count_every: float = 30.0):
+        super().__init__(ttl)
+        self.path = path
+        self.purge_every = purge_every
+        self.count_every = count_every
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS slack_events (event_id TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+        self._since_purge = 0
+        self._count_sync(time.time())
+
+    def _count_sync(self, now: float):
+        # Caller holds the lock (or is __init__)
+        self._size = self._conn.execute("SELECT COUNT(*) FROM slack_events").fetchone()[0]
+        self._counted_at = now
+
+    def _claim_sync(self, event_id: str) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO slack_events (event_id, expires_at) VALUES (?, ?) "
+                "ON CONFLICT(event_id) DO UPDATE SET expires_at = excluded.expires_at "
+                "WHERE slack_events.expires_at < ?",
+                (event_id, now + self.ttl, now),
+            )
+            self._since_purge += 1
+            if self._since_purge >= self.purge_every:
+                self._since_purge = 0
+                self._conn.execute("DELETE FROM slack_events WHERE expires_at < ?", (now,))
+                self._count_sync(now)
+            elif now - self._counted_at >= self.count_every:
+                self._count_sync(now)
+            return cursor.rowcount == 1
+
+    def _release_sync(self, event_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM slack_events WHERE event_id = ?", (event_id,))
+
+    async def _claim(self, event_id: str) -> bool:
+        # SQLite may wait on another process's write lock; keep that off the event loop
+        return await asyncio.to_thread(self._claim_sync, event_id)
+
+    async def release(self, event_id: str):
+        await asyncio.to_thread(self._release_sync, event_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "size": self._size, "size_age_s": round(time.time() - self._counted_at, 1), "path": self.path}
+
+    async def aclose(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisDedupStore(DedupStore):
+    """Store shared across hosts via Redis ``SET NX EX``. Needs the optional ``redis`` package."""
+
+    backend = "redis"
+
+    def __init__(self, url: str = DEDUP_REDIS_URL, ttl: float = DEDUP_TTL, prefix: str = DEDUP_REDIS_PREFIX):
+        super().__init__(ttl)
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("DEDUP_BACKEND=redis needs the 'redis' package (pip install redis)") from e
+        self.prefix = prefix
+        self._redis = redis.from_url(url)
+
+    async def _claim(self, event_id: str) -> bool:
+        return bool(await self._redis.set(f"{self.prefix}{event_id}", 1, nx=True, ex=max(1, int(self.ttl))))
+
+    async def release(self, event_id: str):
+        await self._redis.delete(f"{self.prefix}{event_id}")
+
+    async def aclose(self):
+        await self._redis.aclose()
+
+
+def create_dedup_store(backend: str = DEDUP_BACKEND) -> DedupStore:
+    if backend == "memory":
+        return MemoryDedupStore()
+    if backend == "sqlite":
+        return SQLiteDedupStore()
+    if backend == "redis":
+        return RedisDedupStore()
+    raise ValueError(f"Unknown DEDUP_BACKEND {backend!r}; expected memory, sqlite or redis")
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from sprint_bot.metrics import LatencyStats
+from sprint_bot.tracing import Trace, span, use_trace
+
+EVENT_WORKERS = int(os.environ.get("EVENT_WORKERS", "8"))
+EVENT_QUEUE_SIZE = int(os.environ.get("EVENT_QUEUE_SIZE", "500"))
+
+
+@dataclass(slots=True)
+class SlackEvent:
+    event_id: str
+    user_id: str
+    channel: str
+    text: str
+    slack_team_id: Optional[str] = None
+    received_at: float = field(default_factory=time.monotonic)
+    # Carried across the queue so the worker continues the request's trace
+    trace: Optional[Trace] = None
+
+
+class EventPipeline:
+    """
+    Decouples Slack event ingestion from processing.
+
+    ``submit`` is constant time and never waits: it either enqueues the event
+    or, when the bounded queue is full, refuses it so the endpoint can push
+    back on Slack. A fixed pool of workers drains the queue and runs the
+    handler, which records its own stage timings through ``stage()``.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[SlackEvent], Awaitable[Any]],
+        workers: int = EVENT_WORKERS,
+        max_queue: int = EVENT_QUEUE_SIZE,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.accepted = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self.latency: Dict[str, LatencyStats] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, event: SlackEvent) -> bool:
+        if self._queue is None:
+            raise RuntimeError("EventPipeline.start() has not been called")
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            logger.warning(f"Event queue full ({self.max_queue}); rejecting {event.event_id}")
+            return False
+        self.accepted += 1
+        return True
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0):
+        """Let queued events finish (up to ``timeout``), then stop the workers."""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Event pipeline stopped with {self.depth()} events still queued")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def observe(self, stage: str, seconds: float):
+        stats = self.latency.get(stage)
+        if stats is None:
+            stats = self.latency[stage] = LatencyStats()
+        stats.observe(seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        # Also a tracing span, so stages show up in the event's trace and /metrics
+        start = time.perf_counter()
+        try:
+            with span(name):
+                yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    async def _worker(self, index: int):
+        while True:
+            event = await self._queue.get()
+            waited = time.monotonic() - event.received_at
+            self.observe("queue_wait", waited)
+            if event.trace is not None:
+                event.trace.add("queue_wait", waited)
+            try:
+                with use_trace(event.trace), self.stage("handle"):
+                    await self.handler(event)
+                self.processed += 1
+            except Exception:
+                self.failed += 1
+                logger.exception(f"Event worker {index} failed on {event.event_id}")
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.depth(),
+            "queue_capacity": self.max_queue,
+            "workers": self.workers,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "processed": self.processed,
+            "failed": self.failed,
+            "latency": {stage: stats.snapshot() for stage, stats in self.latency.items()},
+        }
@@ -1,26 +1,154 @@
-def format_tickets_response(tickets):
-    if not tickets:
-        return "No tickets assigned to you."
+import os
+from typing import Dict, Iterable, List, Tuple
 
-    message = "*🎟️ Your Tickets:*\n"
+from cachetools import LRUCache
+
+from sprint_bot.intent_recognition import FEW_SHOT_EXAMPLES, INTENT_REQUIREMENTS, INTENTS
+
+# chat.postMessage truncates text past 40k characters, and long messages are
+# collapsed in the client well before that; keep each message readable
+SLACK_MESSAGE_LIMIT = int(os.environ.get("SLACK_MESSAGE_LIMIT", "3500"))
+# Messages one reply may be split into; the rest of the list is summarized
+SLACK_MAX_CHUNKS = int(os.environ.get("SLACK_MAX_CHUNKS", "5"))
+# Rendered ticket lines kept between requests (one per ticket)
+RENDER_CACHE_SIZE = int(os.environ.get("RENDER_CACHE_SIZE", "50000"))
+
+TICKETS_HEADER = "*🎟️ Your Tickets:*"
+NO_TICKETS_MESSAGE = "No tickets assigned to you."
+
+# ticket id -> (version, rendered line); version is whatever the line depends on
+_fragments = LRUCache(maxsize=RENDER_CACHE_SIZE)
+
+
+def escape_mrkdwn(text: str) -> str:
+    # Slack treats &, < and > as control characters in message text
+    return str(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _ticket_line(ticket) -> str:
+    created_by = ticket.created_by
+    version = (ticket.title, created_by)
+    cached = _fragments.get(ticket.id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    line = f"• *{escape_mrkdwn(ticket.title)}* _(Created by: {escape_mrkdwn(created_by)})_"
+    _fragments[ticket.id] = (version, line)
+    return line
+
+
+def _more_note(remaining: int) -> str:
+    return f"\n\n_…and {remaining} more not shown._"
+
+
+def chunk_lines(lines: Iterable[Tuple[str, str]], header: str, limit: int = SLACK_MESSAGE_LIMIT, max_chunks: int = SLACK_MAX_CHUNKS) -> List[str]:
+    """
+    Pack (section, line) pairs into messages of at most ``limit`` characters.
+    Lines are never split; a section heading is repeated when its lines
+    continue in the next message. Past ``max_chunks`` messages the remaining
+    lines are counted in a closing note instead of being sent; lines are
+    moved from the last message into that count until the note fits.
+    """
+    chunks: List[str] = []
+    current: List[str] = [header]
+    # Parallel to ``current``: True for a packed line, False for a header or heading
+    is_line: List[bool] = [False]
+    size = len(header)
+    section = None
+    remaining = 0
+    for heading, line in lines:
+        if len(chunks) >= max_chunks:
+            remaining += 1
+            continue
+        if len(line) > limit // 2:
+            line = line[:limit // 2 - 1] + "…"
+        title = f"\n*{heading}*" if section != heading else None
+        if size + len(line) + 1 + (len(title) + 1 if title else 0) > limit:
+            chunks.append("\n".join(current))
+            if len(chunks) >= max_chunks:
+                remaining += 1
+                continue
+            # A new message restarts its section heading
+            current = [f"*{heading}* _(continued)_" if section == heading else f"*{heading}*"]
+            is_line = [False]
+            size = len(current[0])
+            title = None
+        if title:
+            current.append(title)
+            is_line.append(False)
+            size += len(title) + 1
+        current.append(line)
+        is_line.append(True)
+        size += len(line) + 1
+        section = heading
+    if len(chunks) >= max_chunks:
+        # The last message is ``current``; it was packed before the note existed
+        chunks.pop()
+    if remaining:
+        while size + len(_more_note(remaining)) > limit and len(current) > 1:
+            size -= len(current.pop()) + 1
+            if is_line.pop():
+                remaining += 1
+            # Don't leave a heading with no lines under it
+            while len(current) > 1 and not is_line[-1]:
+                size -= len(current.pop()) + 1
+                is_line.pop()
+    chunks.append("\n".join(current))
+    if remaining:
+        chunks[-1] += _more_note(remaining)
+    return chunks
+
+
+def format_tickets_response(tickets) -> List[str]:
+    """
+    Render tickets grouped by status as one or more Slack-sized messages.
+    tickets can be any iterable (e.g. a generator over a streamed listing).
+    """
+    groups: Dict[str, List[str]] = {}
+    directory = None
     for ticket in tickets:
-        title = ticket["title"]
-        status = ticket["status"]
-        created_by = ticket["created_by"]
-        message += f"\n• *{title}* _(Status: {status}, Created by: {created_by})_"
+        directory = ticket.directory
+        groups.setdefault(ticket.status_id, []).append(_ticket_line(ticket))
+    if not groups:
+        return [NO_TICKETS_MESSAGE]
+    # Sections follow the project's status order (as Zoho lists them)
+    order = {status_id: index for index, status_id in enumerate(directory.statuses)}
+    lines = (
+        (f"{directory.status_name(status_id)} ({len(groups[status_id])})", line)
+        for status_id in sorted(groups, key=lambda status_id: order.get(status_id, len(order)))
+        for line in groups[status_id]
+    )
+    return chunk_lines(lines, TICKETS_HEADER)
+
+
+def format_bulk_summary(action, results):
+    # results are (label, succeeded, detail) tuples, one per item, in request order
+    succeeded = sum(1 for _, ok, _ in results if ok)
+    lines = [f"*{action} {succeeded} of {len(results)} tickets*", ""]
+    lines.extend(f"{'✅' if ok else '❌'} {label} — {detail}" for label, ok, detail in results)
+    return "\n".join(lines)
+
+
+def _build_capabilities_message() -> str:
+    examples: Dict[str, List[str]] = {}
+    for example in FEW_SHOT_EXAMPLES:
+        examples.setdefault(example["intent"], []).append(example["query"])
+    lines = ["*🤖 Here are the tasks I can help you with:*", ""]
+    for number, (intent, description) in enumerate(INTENTS.items(), start=1):
+        lines.append(f"{number}. *{intent.replace('_', ' ').title()}*: {description}")
+        # Examples are shown in double quotes, so their own quotes become single ones
+        usage = ", ".join('"' + query.replace('"', "'") + '"' for query in examples.get(intent, [])[:2])
+        if usage:
+            lines.append(f"   - _How to use_: {usage}")
+        requirements = INTENT_REQUIREMENTS.get(intent)
+        if requirements:
+            lines.append(f"   - _Requirements_: {requirements}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+# Built once from the intent registry, so new intents show up automatically
+BOT_CAPABILITIES_MESSAGE = _build_capabilities_message()
 
-    return message
 
 def get_bot_capabilities_message():
-    return (
-        "*🤖 Here are the tasks I can help you with:*\n\n"
-        "1. *Get My Tickets*: Fetch all tickets assigned to you.\n"
-        "   - _How to use_: \"Show me my tickets\", \"What tasks do I have assigned?\"\n"
-        "   - _Requirements_: None.\n\n"
-        "2. *Create Ticket*: Create a new ticket with a title and assignee.\n"
-        "   - _How to use_: \"Add a new ticket titled 'Fix login bug' and assign it to Alice\", \"Add this to my tickets 'Modify warehouse layer'\"\n"
-        "   - _Requirements_: You must specify the ticket title. Optionally, you can specify the assignee (e.g., a name or 'me').\n\n"
-        "3. *Bot Capabilities*: List all tasks I can perform and their requirements.\n"
-        "   - _How to use_: \"What can you do?\", \"Help\", \"List all features\"\n"
-        "   - _Requirements_: None.\n"
-    )
\ No newline at end of file
+    return BOT_CAPABILITIES_MESSAGE
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from loguru import logger
+
+SPRINTBOT_IDENTITY_FILE = os.environ.get("SPRINTBOT_IDENTITY_FILE", "identities.json")
+
+# Minimum score for a fuzzy match to be used at all, and how far ahead of the
+# runner-up the best match has to be before we act on it without asking
+NAME_MATCH_MIN_SCORE = 0.5
+NAME_MATCH_MARGIN = 0.1
+
+_NON_ALNUM = re.compile(r"[^a-z0-9\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    # "Álice  S." -> "alice s"
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return _SPACES.sub(" ", _NON_ALNUM.sub(" ", name.lower())).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Precomputed lookup over a sprint roster (user id -> display name).
+
+    Holds exact normalized names, every prefix of every name token and a
+    trigram index, so "Al", "alice s." or a first name alone resolve with a
+    few dict lookups instead of a scan. ``update`` only rebuilds when the
+    roster actually changed.
+    """
+
+    def __init__(self):
+        self._source = None
+        self._roster: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self._exact: Dict[str, Set[str]] = {}
+        self._prefix: Dict[str, Set[str]] = {}
+        self._trigram: Dict[str, Set[str]] = {}
+        self.builds = 0
+
+    def update(self, roster: Optional[Mapping[str, str]]) -> bool:
+        """Rebuild from ``roster`` if it differs from the indexed one. Returns True if rebuilt."""
+        if roster is not None and roster is self._source:
+            # Same cached object as last time; nothing can have changed
+            return False
+        self._source = roster
+        roster = dict(roster or {})
+        if roster == self._roster:
+            return False
+        self._roster = roster
+        self._names = {user_id: normalize_name(name) for user_id, name in roster.items()}
+        self._exact, self._prefix, self._trigram = {}, {}, {}
+        for user_id, name in self._names.items():
+            self._exact.setdefault(name, set()).add(user_id)
+            for token in name.split():
+                for end in range(1, len(token) + 1):
+                    self._prefix.setdefault(token[:end], set()).add(user_id)
+            for gram in _trigrams(name):
+                self._trigram.setdefault(gram, set()).add(user_id)
+        self.builds += 1
+        return True
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[str, str, float]]:
+        """Return up to ``limit`` (user_id, display_name, score) tuples, best first."""
+        query = normalize_name(query)
+        if not query:
+            return []
+        scores: Dict[str, float] = {}
+
+        for user_id in self._exact.get(query, ()):
+            scores[user_id] = 1.0
+
+        # Every query token has to prefix some token of the name ("alice s", "al")
+        tokens = query.split()
+        candidates = None
+        for token in tokens:
+            matches = self._prefix.get(token, set())
+            candidates = set(matches) if candidates is None else candidates & matches
+        for user_id in candidates or ():
+            name_tokens = self._names[user_id].split()
+            covered = sum(len(t) for t in tokens) / max(1, sum(len(t) for t in name_tokens))
+            whole_tokens = sum(1 for t in tokens if t in name_tokens) / len(tokens)
+            score = 0.6 + 0.2 * whole_tokens + 0.15 * min(1.0, covered)
+            scores[user_id] = max(scores.get(user_id, 0.0), score)
+
+        # Typos: share of the query's trigrams found in the name, only for
+        # users sharing at least one trigram
+        grams = _trigrams(query)
+        overlap: Dict[str, int] = {}
+        for gram in grams:
+            for user_id in self._trigram.get(gram, ()):
+                overlap[user_id] = overlap.get(user_id, 0) + 1
+        for user_id, shared in overlap.items():
+            containment = shared / len(grams)
+            if containment >= 0.5:
+                scores[user_id] = max(scores.get(user_id, 0.0), 0.8 * containment)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self._roster[item[0]]))
+        return [(user_id, self._roster[user_id], round(score, 3)) for user_id, score in ranked[:limit]]
+
+    def exact(self, name: str) -> Optional[str]:
+        """The one user whose normalized name is exactly ``name``, or None (no match or a tie)."""
+        user_ids = self._exact.get(normalize_name(name), ())
+        return next(iter(user_ids)) if len(user_ids) == 1 else None
+
+    def resolve(self, query: str) -> Tuple[Optional[str], List[Tuple[str, str, float]]]:
+        """
+        Return (user_id, matches). user_id is set only when the best match is
+        good enough and clearly ahead of the next one; otherwise the caller can
+        show ``matches`` to disambiguate.
+        """
+        matches = [m for m in self.search(query) if m[2] >= NAME_MATCH_MIN_SCORE]
+        if not matches:
+            return None, []
+        if len(matches) == 1 or matches[0][2] - matches[1][2] >= NAME_MATCH_MARGIN:
+            return matches[0][0], matches
+        return None, matches
+
+
+class IdentityIndex:
+    """
+    Persistent Slack user id -> Zoho user id map, per tenant, stored as JSON.
+    The file may be shared by several workers: each write re-reads it, adds
+    the new link and renames a private temp file into place, off the event
+    loop. Two workers saving at the same instant can still drop one link;
+    it is learned again on that user's next message.
+    """
+
+    def __init__(self, path: Optional[str] = SPRINTBOT_IDENTITY_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._links: Dict[str, Dict[str, str]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, str]]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            logger.exception(f"Could not read identity file {self.path}; starting empty")
+            return {}
+
+    def _save(self, tenant: str, slack_user_id: str, zoho_user_id: str) -> Dict[str, Dict[str, str]]:
+        # Merge into what's on disk so links learned by other workers survive
+        with self._lock:
+            links = self._read()
+            links.setdefault(tenant, {})[slack_user_id] = zoho_user_id
+            fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(self.path)}.", suffix=".tmp", dir=os.path.dirname(os.path.abspath(self.path)))
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(links, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return links
+
+    def get(self, tenant: str, slack_user_id: Optional[str]) -> Optional[str]:
+        return self._links.get(tenant, {}).get(slack_user_id)
+
+    async def link(self, tenant: str, slack_user_id: str, zoho_user_id: str):
+        if self.get(tenant, slack_user_id) == zoho_user_id:
+            return
+        self._links.setdefault(tenant, {})[slack_user_id] = zoho_user_id
+        if not self.path:
+            return
+        try:
+            links = await asyncio.to_thread(self._save, tenant, slack_user_id, zoho_user_id)
+        except OSError:
+            logger.exception(f"Could not persist identity link for {slack_user_id}")
+            return
+        # Pick up what other workers have learned in the meantime
+        for name, tenant_links in links.items():
+            self._links.setdefault(name, {}).update(tenant_links)
+
+    def __len__(self) -> int:
+        return sum(len(links) for links in self._links.values())
@@ -0,0 +1,143 @@
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+
+INTENT_CACHE_SIZE = int(os.environ.get("INTENT_CACHE_SIZE", "2048"))
+INTENT_CACHE_TTL = float(os.environ.get("INTENT_CACHE_TTL", "3600"))
+
+_QUOTED = re.compile(r"[\"']([^\"']+)[\"']")
+_TICKET_ID = re.compile(r"\bI?\d+\b", re.IGNORECASE)
+_NON_WORD = re.compile(r"[^\w\s<>]+")
+_SPACES = re.compile(r"\s+")
+
+# Result keys that carry entities pulled out of the query
+ENTITY_FIELDS = ("title", "ticket_id")
+# Same, for bulk intents where the key holds a list of entities
+ENTITY_LIST_FIELDS = ("titles", "ticket_ids")
+# Templated when the value is one of the query's entities (a quoted "bob");
+# otherwise the value is still part of the key ("assign to bob") and kept as is
+OPTIONAL_ENTITY_FIELDS = ("assignee",)
+
+_NO_INTENT = object()
+
+
+def normalize_query(query: str) -> Tuple[str, List[str]]:
+    """
+    Fold a query to a cache key and return the entities templated out of it.
+
+    Quoted titles become <e0>, <e1>, ... and ticket ids (I2378, 2378) follow
+    on, so "Delete ticket I2378" and "delete ticket i99!" share a key. Case,
+    punctuation and whitespace are folded after the entities are removed.
+    """
+    entities: List[str] = []
+
+    def _template(match):
+        entities.append(match.group(1) if match.re is _QUOTED else match.group(0))
+        return f" <e{len(entities) - 1}> "
+
+    templated = _QUOTED.sub(_template, query)
+    templated = _TICKET_ID.sub(_template, templated)
+    key = _SPACES.sub(" ", _NON_WORD.sub(" ", templated.lower())).strip()
+    return key, entities
+
+
+def _to_template(result: Dict[str, Any], entities: List[str]) -> Optional[Dict[str, Any]]:
+    # Swap entity values for their placeholder index. If a value can't be
+    # traced back to the query, the result is specific to it and not cacheable.
+    folded = [entity.strip().lower() for entity in entities]
+    template = dict(result)
+    for field in ENTITY_FIELDS:
+        value = template.get(field)
+        if value is None:
+            continue
+        try:
+            template[field] = ("<entity>", folded.index(str(value).strip().lower()))
+        except ValueError:
+            return None
+    for field in ENTITY_LIST_FIELDS:
+        values = template.get(field)
+        if values is None:
+            continue
+        try:
+            # Expanded ranges ("I10-I15") don't map back and aren't cached
+            template[field] = [("<entity>", folded.index(str(value).strip().lower())) for value in values]
+        except ValueError:
+            return None
+    for field in OPTIONAL_ENTITY_FIELDS:
+        value = template.get(field)
+        if isinstance(value, str) and value.strip().lower() in folded:
+            template[field] = ("<entity>", folded.index(value.strip().lower()))
+    # Any other field holding a templated entity would be replayed verbatim
+    # for a different query, so don't cache it
+    for field, value in template.items():
+        if isinstance(value, str) and value.strip().lower() in folded:
+            return None
+    return template
+
+
+def _from_template(template: Dict[str, Any], entities: List[str]) -> Dict[str, Any]:
+    result = dict(template)
+    for field in ENTITY_FIELDS + OPTIONAL_ENTITY_FIELDS:
+        value = result.get(field)
+        if isinstance(value, tuple) and value[0] == "<entity>":
+            entity = entities[value[1]]
+            result[field] = entity.upper() if field == "ticket_id" else entity
+    for field in ENTITY_LIST_FIELDS:
+        values = result.get(field)
+        if isinstance(values, list):
+            result[field] = [
+                entities[value[1]].upper() if field == "ticket_ids" else entities[value[1]]
+                for value in values
+            ]
+    return result
+
+
+class IntentCache:
+    """
+    Memoizes intent detection by normalized query (see normalize_query), with
+    size and TTL eviction. "No intent" answers are cached too, so repeated
+    small talk doesn't keep hitting the LLM.
+    """
+
+    def __init__(self, maxsize: int = INTENT_CACHE_SIZE, ttl: float = INTENT_CACHE_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, query: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Return (found, result). result is None for a cached "no intent"."""
+        key, entities = normalize_query(query)
+        template = self._cache.get(key)
+        if template is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        if template is _NO_INTENT:
+            return True, None
+        return True, _from_template(template, entities)
+
+    def store(self, query: str, result: Optional[Dict[str, Any]]):
+        key, entities = normalize_query(query)
+        if result is None:
+            self._cache[key] = _NO_INTENT
+            return
+        template = _to_template(result, entities)
+        if template is not None:
+            self._cache[key] = template
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._cache),
+        }
+
+
+intent_cache = IntentCache()
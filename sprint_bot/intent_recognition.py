@@ -1,9 +1,18 @@
-from openai import OpenAI
+import asyncio
+import importlib
 import os
 import dotenv
 import re
-from typing import Optional, Dict, Any
+from difflib import SequenceMatcher
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 import json
+from loguru import logger
+from sprint_bot.intent_cache import intent_cache
+from sprint_bot.resilience import ResiliencePolicy, UpstreamUnavailable
+from sprint_bot.tracing import span
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 dotenv.load_dotenv()
 
@@ -14,8 +23,23 @@ INTENTS = {
     "create_ticket": "Create a new ticket with a title and optional assignee.",
     "bot_capabilities": "List all tasks the bot can perform and their requirements.",
     "delete_ticket": "Delete a ticket by its ticket ID.",
+    "bulk_create_tickets": "Create several tickets at once from a list of titles, with an optional shared assignee.",
+    "bulk_delete_tickets": "Delete several tickets at once by a list or range of ticket IDs.",
+}
+
+# What each intent needs from the user, shown in the capabilities message
+INTENT_REQUIREMENTS = {
+    "get_my_tickets": "None.",
+    "create_ticket": "You must specify the ticket title. Optionally, you can specify the assignee (e.g., a name or 'me').",
+    "bot_capabilities": "None.",
+    "delete_ticket": "You must specify the ticket ID (e.g., I2378).",
+    "bulk_create_tickets": "You must list the ticket titles, each in quotes. Optionally, you can specify one assignee for all of them.",
+    "bulk_delete_tickets": "You must list the ticket IDs (e.g., I101, I102 and I107) or give a range (e.g., I40 to I45).",
 }
 
+# Most items a single bulk request may touch
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "50"))
+
 # Define prompt examples
 FEW_SHOT_EXAMPLES = [
     {"query": "Show me my tickets", "intent": "get_my_tickets"},
@@ -31,17 +55,124 @@ FEW_SHOT_EXAMPLES = [
     {"query": "Delete ticket I2378", "intent": "delete_ticket", "ticket_id": "I2378"},
     {"query": "Remove ticket with ID I2312", "intent": "delete_ticket", "ticket_id": "I2312"},
     {"query": "Delete the ticket I1212", "intent": "delete_ticket", "ticket_id": "I1212"},
+    {"query": "Create tickets \"Set up CI\", \"Write docs\" and \"Add metrics\" for Bob", "intent": "bulk_create_tickets", "titles": ["Set up CI", "Write docs", "Add metrics"], "assignee": "Bob"},
+    {"query": "Delete tickets I101, I102 and I107", "intent": "bulk_delete_tickets", "ticket_ids": ["I101", "I102", "I107"]},
+    {"query": "Remove tickets I40 to I45", "intent": "bulk_delete_tickets", "ticket_ids": ["I40", "I41", "I42", "I43", "I44", "I45"]},
 ]
 
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "10"))
+
+SYSTEM_PROMPT = "You are an assistant that extracts intent, title, and assignee from user queries and always responds in valid JSON (double quotes, not single quotes)."
+
+
+def _build_prompt_prefix() -> str:
+    parts = [
+        "You are an assistant that classifies user queries into intents and extracts ticket title and assignee if present.\n"
+        "Respond ONLY in valid JSON (double quotes, not single quotes) with keys: intent, title (if present), assignee (if present), "
+        "and for bulk intents titles or ticket_ids (lists).\n"
+        "Here are some examples:\n\n"
+    ]
+    for ex in FEW_SHOT_EXAMPLES:
+        example = {"intent": ex['intent']}
+        if ex.get("title"):
+            example["title"] = ex["title"]
+        if ex.get("titles"):
+            example["titles"] = ex["titles"]
+        if ex.get("assignee"):
+            example["assignee"] = ex["assignee"]
+        if ex.get("ticket_ids"):
+            example["ticket_ids"] = ex["ticket_ids"]
+        parts.append(f'User: {ex["query"]}\n{json.dumps(example)}\n\n')
+    return "".join(parts)
+
+
+# The few-shot part of the prompt never changes, so build it once
+PROMPT_PREFIX = _build_prompt_prefix()
+
+# Patterns used on every request are compiled once at import
+# A matching pair of quotes; single quotes only at word boundaries, so the
+# apostrophes in "don't" or "bob's" never open or close a title
+_QUOTED = r"\"([^\"\n]+)\"|(?<!\w)'([^\n]+?)'(?!\w)"
+_TITLE_AFTER_KEYWORD = re.compile(rf"(?:titled|called|ticket|add|this to my tickets)[\s:]*(?:{_QUOTED})", re.IGNORECASE)
+_QUOTED_TITLE = re.compile(_QUOTED)
+_ASSIGNEE = re.compile(r"assign(?: it)? to ([\w\s]+)", re.IGNORECASE)
+_TICKET_ID = re.compile(r"(?:ticket(?:\s*with)?(?:\s*id)?\s*)?(I?\d+)", re.IGNORECASE)
+_FALLBACK_INTENT = re.compile(r"Intent:\s*([^\n]+)", re.IGNORECASE)
+_FALLBACK_TITLE = re.compile(r"Title:\s*([^\n]+)", re.IGNORECASE)
+_FALLBACK_ASSIGNEE = re.compile(r"Assignee:\s*([^\n]+)", re.IGNORECASE)
+_FALLBACK_TICKET_ID = re.compile(r"ticket_id\s*[:=]\s*(I?\d+)", re.IGNORECASE)
+_INTENT_NAMES = {k.lower() for k in INTENTS}
+# Bulk entities: "I10-I15" / "I10 to I15" ranges (both ends prefixed, so "2023-2024"
+# isn't one), I-prefixed ids, and "- title" / "1. title" list lines
+_TICKET_RANGE = re.compile(r"\bI(\d+)\s*(?:-|–|to|through)\s*I(\d+)\b", re.IGNORECASE)
+_PREFIXED_TICKET_ID = re.compile(r"\bI(\d+)\b", re.IGNORECASE)
+# Anything that could be read as a ticket number, prefixed or not
+_ANY_TICKET_NUMBER = re.compile(r"\bI?\d+\b", re.IGNORECASE)
+# A delete that is nothing but a list of ids: "delete tickets I1, I2 and I3",
+# "remove I40 to I45". Anything else with several ids goes to the LLM
+_ID_OR_RANGE = r"I\d+(?:\s*(?:-|–|to|through)\s*I\d+)?"
+_BULK_DELETE_LIST = re.compile(
+    rf"^\W*(?:please\s+)?(?:delete|remove)\s+(?:(?:the\s+)?(?:tickets|items)\s*:?\s*)?"
+    rf"{_ID_OR_RANGE}(?:\s*(?:,\s*and|,|and|&)\s*{_ID_OR_RANGE})*\W*$",
+    re.IGNORECASE,
+)
+_LIST_LINE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.+?)\s*$", re.MULTILINE)
+_BULK_ASSIGNEE = re.compile(r"\b(?:assign(?: them| it)? to|for) ([\w ]+?)\s*:?\s*$", re.IGNORECASE)
+# An assignee on its own line after the list: "for alice", "assign them to bob."
+_TRAILING_ASSIGNEE = re.compile(r"^(?:assign(?: them| it)? to|for) ([\w ]+?)\s*\.?$", re.IGNORECASE)
+_MENTIONS_ASSIGNEE = re.compile(r"\b(?:for|assign)\b", re.IGNORECASE)
+_BULK_CREATE = re.compile(r"\b(?:create|add|new)\b.*\btickets\b", re.IGNORECASE)
+
+_openai_client: Optional["AsyncOpenAI"] = None
+
+# Circuit breaker and jittered retries for the completions endpoint (the
+# client's own retries are off so the two don't multiply)
+openai_policy = ResiliencePolicy("openai")
+
+
+def get_openai_client() -> "AsyncOpenAI":
+    # One client per process so every call reuses the same keep-alive pool.
+    # openai is about half of the app's import time and most messages never
+    # reach the LLM, so it's imported here rather than at module load
+    global _openai_client
+    if _openai_client is None:
+        from openai import AsyncOpenAI
+
+        _openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=OPENAI_TIMEOUT, max_retries=0)
+    return _openai_client
+
+
+def _is_transient_openai_error(error: Exception) -> bool:
+    # Only reached once the client exists, so openai is already imported
+    import openai
+
+    return isinstance(error, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError))
+
+
+async def warm_openai_client() -> bool:
+    """Import openai off the event loop and build the client, so the first LLM call doesn't pay for it."""
+    await asyncio.to_thread(importlib.import_module, "openai")
+    get_openai_client()
+    return True
+
+
+async def aclose_openai_client():
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+
 def extract_title_and_assignee(query: str) -> Dict[str, Any]:
     # Try to extract title in quotes
-    title_match = re.search(r"(?:titled|called|ticket|add|this to my tickets)[\s:]*[\"']([^\"']+)[\"']", query, re.IGNORECASE)
+    title_match = _TITLE_AFTER_KEYWORD.search(query)
     if not title_match:
-        title_match = re.search(r"[\"']([^\"']+)[\"']", query)
-    title = title_match.group(1) if title_match else None
+        title_match = _QUOTED_TITLE.search(query)
+    title = (title_match.group(1) or title_match.group(2)) if title_match else None
 
     # Try to extract assignee
-    assignee_match = re.search(r"assign(?: it)? to ([\w\s]+)", query, re.IGNORECASE)
+    assignee_match = _ASSIGNEE.search(query)
     if assignee_match:
         assignee = assignee_match.group(1).strip()
     elif "to my tickets" in query or "for me" in query or "assign to me" in query:
@@ -53,7 +184,7 @@ def extract_title_and_assignee(query: str) -> Dict[str, Any]:
 
 def extract_ticket_id(query: str) -> str:
     # Match patterns like 'I2378', 'ticket I2378', 'ticket no I2378', etc.
-    match = re.search(r"(?:ticket(?:\s*with)?(?:\s*id)?\s*)?(I?\d+)", query, re.IGNORECASE)
+    match = _TICKET_ID.search(query)
     if match:
         ticket_id = match.group(1)
         # If it starts with 'I', strip it for internal use, but keep for item_no matching
@@ -62,34 +193,243 @@ def extract_ticket_id(query: str) -> str:
         return ticket_id
     return None
 
-def detect_intent(query: str) -> Optional[Dict[str, Any]]:
-    prompt = (
-        "You are an assistant that classifies user queries into intents and extracts ticket title and assignee if present.\n"
-        "Respond ONLY in valid JSON (double quotes, not single quotes) with keys: intent, title (if present), assignee (if present).\n"
-        "Here are some examples:\n\n"
-    )
-    for ex in FEW_SHOT_EXAMPLES:
-        example = {"intent": ex['intent']}
-        if ex.get("title"):
-            example["title"] = ex["title"]
-        if ex.get("assignee"):
-            example["assignee"] = ex["assignee"]
-        prompt += f'User: {ex["query"]}\n{json.dumps(example)}\n\n'
-    prompt += f'User: {query}\n'
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[
-            {"role": "system", "content": "You are an assistant that extracts intent, title, and assignee from user queries and always responds in valid JSON (double quotes, not single quotes)."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0,
-        max_tokens=150,
-        top_p=1.0,
-        frequency_penalty=0.0,
-        presence_penalty=0.0,
-        stop=["\n", "User:", "Assistant:"]
-    )
+def extract_ticket_ids(query: str) -> List[str]:
+    """
+    All ticket ids in ``query`` in order, with ranges expanded ("I10-I12" ->
+    I10, I11, I12). Stops expanding past BULK_MAX_ITEMS + 1 so an absurd
+    range can't blow up; callers reject anything over the limit.
+    """
+    ids: List[str] = []
+    limit = BULK_MAX_ITEMS + 1
+    position = 0
+    for match in _TICKET_RANGE.finditer(query):
+        ids.extend(f"I{n}" for n in _PREFIXED_TICKET_ID.findall(query[position:match.start()]))
+        first, last = int(match.group(1)), int(match.group(2))
+        if first <= last:
+            ids.extend(f"I{n}" for n in range(first, min(last, first + limit) + 1))
+        position = match.end()
+    ids.extend(f"I{n}" for n in _PREFIXED_TICKET_ID.findall(query[position:]))
+    # Keep the first occurrence of each id
+    return list(dict.fromkeys(ids))[:limit]
+
+def count_ticket_ids(query: str) -> int:
+    """How many distinct ids ``query`` names, counting ranges in full (nothing is expanded)."""
+    spans = []
+    position = 0
+    for match in _TICKET_RANGE.finditer(query):
+        spans.extend((int(n), int(n)) for n in _PREFIXED_TICKET_ID.findall(query[position:match.start()]))
+        first, last = int(match.group(1)), int(match.group(2))
+        if first <= last:
+            spans.append((first, last))
+        position = match.end()
+    spans.extend((int(n), int(n)) for n in _PREFIXED_TICKET_ID.findall(query[position:]))
+    # Merge overlapping spans so repeated ids count once
+    count, end = 0, -1
+    for first, last in sorted(spans):
+        if last > end:
+            count += last - max(first, end + 1) + 1
+            end = last
+    return count
+
+def extract_titles_and_assignee(query: str) -> Dict[str, Any]:
+    """
+    Titles (quoted, or else one per bulleted/numbered line) and the shared
+    assignee, from the request line or a line of its own after the list.
+    "clear" is False when the text around the titles has something these
+    patterns can't account for (a stray quote or apostrophe, an assignee that
+    isn't a plain name, other trailing lines); classify_bulk leaves those to
+    the LLM.
+    """
+    titles = [title.strip() for pair in _QUOTED_TITLE.findall(query) for title in pair if title.strip()]
+    if len(titles) >= 2:
+        # Titles are marked so an assignee can't run across one
+        rest = _QUOTED_TITLE.sub("\0", query).split("\n")
+    else:
+        titles = [title for title in _LIST_LINE.findall(query) if title]
+        rest = [line for line in query.split("\n") if not _LIST_LINE.match(line)]
+    rest = [line.strip() for line in rest if line.strip()]
+    clear = not any("'" in line or '"' in line for line in rest)
+    assignees = []
+    for number, line in enumerate(rest):
+        match = (_BULK_ASSIGNEE.search if number == 0 else _TRAILING_ASSIGNEE.match)(line)
+        if match:
+            assignees.append(match.group(1).strip())
+        elif number > 0 or _MENTIONS_ASSIGNEE.search(line):
+            clear = False
+    if len(assignees) > 1:
+        clear = False
+    return {"titles": titles, "assignee": assignees[0] if assignees else None, "clear": clear}
+
+def classify_bulk(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Recognize multi-ticket create/delete requests; None if it isn't one.
+    Deletes are only answered here for a bare list or range of ids, since a
+    stray second id ("delete I100, it's a duplicate of I99") must not be
+    deleted too.
+    """
+    if _BULK_DELETE_LIST.match(query):
+        ticket_ids = extract_ticket_ids(query)
+        if len(ticket_ids) >= 2:
+            result = {"intent": "bulk_delete_tickets", "ticket_ids": ticket_ids}
+            # The list is cut off past BULK_MAX_ITEMS; keep the real size for the refusal
+            count = count_ticket_ids(query)
+            if count > len(ticket_ids):
+                result["ticket_count"] = count
+            return result
+    elif _BULK_CREATE.search(query):
+        extracted = extract_titles_and_assignee(query)
+        if extracted["clear"] and len(extracted["titles"]) >= 2:
+            result = {"intent": "bulk_create_tickets", "titles": extracted["titles"]}
+            if extracted["assignee"]:
+                result["assignee"] = extracted["assignee"]
+            return result
+    return None
+
+# Local fast path: high-confidence patterns answered without calling the LLM.
+# A query matching more than one pattern is ambiguous and goes to the LLM.
+LOCAL_INTENT_PATTERNS = {
+    "bot_capabilities": re.compile(
+        r"^\W*(?:help|what can you do|what do you do|list (?:all )?(?:features|commands|capabilities)|capabilities)\W*$",
+        re.IGNORECASE,
+    ),
+    "get_my_tickets": re.compile(
+        r"^\W*(?:show|list|get|fetch|what are)\b.*\bmy\b.*\b(?:tickets|tasks|items)\W*$"
+        r"|^\W*what (?:tasks|tickets) do i have(?: assigned)?\W*$",
+        re.IGNORECASE,
+    ),
+    # Only a plain imperative with nothing but the id; "don't delete I5" or
+    # "how do i delete I5?" go to the LLM
+    "delete_ticket": re.compile(
+        r"^\W*(?:please\s+)?(?:delete|remove)\s+(?:the\s+)?(?:(?:ticket|item)\s+)?(?:with\s+)?(?:id\s*)?:?\s*I\d+"
+        r"(?:\s+please)?[.!\s]*$",
+        re.IGNORECASE,
+    ),
+    "create_ticket": re.compile(r"\b(?:create|add|new)\b.*\btickets?\b", re.IGNORECASE),
+}
+
+# Intents that carry no entities, so a close match to an example is enough
+SIMILARITY_INTENTS = {"get_my_tickets", "bot_capabilities"}
+SIMILARITY_THRESHOLD = 0.85
+# Looser match used only while the LLM is unavailable
+DEGRADED_SIMILARITY_THRESHOLD = float(os.getenv("DEGRADED_SIMILARITY_THRESHOLD", "0.6"))
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def _normalize(query: str) -> str:
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", query.lower())).strip()
+
+
+_SIMILARITY_EXAMPLES = [
+    (_normalize(ex["query"]), ex["intent"]) for ex in FEW_SHOT_EXAMPLES if ex["intent"] in SIMILARITY_INTENTS
+]
+
+
+def _build_local_result(intent: str, query: str) -> Optional[Dict[str, Any]]:
+    result = {"intent": intent}
+    if intent == "delete_ticket":
+        # Several numbers could mean several tickets, or one ticket and some
+        # context; let the LLM decide which
+        if len(_ANY_TICKET_NUMBER.findall(query)) > 1:
+            return None
+        ticket_id = extract_ticket_id(query)
+        if not ticket_id:
+            return None
+        result["ticket_id"] = ticket_id
+    elif intent == "create_ticket":
+        # Several titles that classify_bulk couldn't read cleanly; creating
+        # just the first would be wrong
+        if len(_QUOTED_TITLE.findall(query)) > 1 or len(_LIST_LINE.findall(query)) > 1:
+            return None
+        extracted = extract_title_and_assignee(query)
+        # Without a quoted title the LLM does a better job of finding one
+        if not extracted["title"]:
+            return None
+        result["title"] = extracted["title"]
+        if extracted["assignee"]:
+            result["assignee"] = extracted["assignee"]
+    return result
+
+
+def classify_locally(query: str, threshold: float = SIMILARITY_THRESHOLD) -> Optional[Dict[str, Any]]:
+    """
+    Classify high-confidence queries without the LLM: first by the compiled
+    LOCAL_INTENT_PATTERNS, then by string similarity to the entity-free
+    FEW_SHOT_EXAMPLES. Multi-ticket requests are recognized first (see
+    classify_bulk). Returns None when the query is ambiguous.
+    """
+    bulk = classify_bulk(query)
+    if bulk is not None:
+        return bulk
+    matches = [intent for intent, pattern in LOCAL_INTENT_PATTERNS.items() if pattern.search(query)]
+    if len(matches) == 1:
+        return _build_local_result(matches[0], query)
+    if matches:
+        return None
+
+    normalized = _normalize(query)
+    best_intent, best_score = None, 0.0
+    for example, intent in _SIMILARITY_EXAMPLES:
+        score = SequenceMatcher(None, normalized, example).ratio()
+        if score > best_score:
+            best_intent, best_score = intent, score
+    if best_score >= threshold:
+        return {"intent": best_intent}
+    return None
+
+
+async def detect_intent(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Tiered intent detection. The result's "tier" key says which stage
+    answered: "local" for the pattern/similarity fast path, "cache" for a
+    memoized LLM answer (see sprint_bot.intent_cache), "llm" otherwise, and
+    "degraded" for a looser local guess while OpenAI is unavailable.
+    """
+    result = classify_locally(query)
+    if result is not None:
+        result["tier"] = "local"
+        return result
+    found, result = intent_cache.lookup(query)
+    if found:
+        if result is not None:
+            result["tier"] = "cache"
+        return result
+    try:
+        result = await _detect_intent_llm(query)
+    except UpstreamUnavailable as e:
+        # Best local guess; not cached, so the LLM answers once it's back
+        logger.warning(f"Intent detection falling back to local matching: {e}")
+        result = classify_locally(query, threshold=DEGRADED_SIMILARITY_THRESHOLD)
+        if result is not None:
+            result["tier"] = "degraded"
+        return result
+    intent_cache.store(query, result)
+    if result is not None:
+        result["tier"] = "llm"
+    return result
+
+
+async def _detect_intent_llm(query: str) -> Optional[Dict[str, Any]]:
+    prompt = f'{PROMPT_PREFIX}User: {query}\n'
+
+    async def complete():
+        return await get_openai_client().chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0,
+            max_tokens=150,
+            top_p=1.0,
+            frequency_penalty=0.0,
+            presence_penalty=0.0,
+            stop=["\n", "User:", "Assistant:"]
+        )
+
+    with span("openai"):
+        response = await openai_policy.call("chat.completions", complete, is_error=_is_transient_openai_error)
     content = response.choices[0].message.content.strip()
 
     try:
@@ -105,15 +445,20 @@ def detect_intent(query: str) -> Optional[Dict[str, Any]]:
             ticket_id = extract_ticket_id(query)
             if ticket_id:
                 result["ticket_id"] = ticket_id
+        # For bulk intents, fall back to the local extractors for the lists
+        if result.get("intent") == "bulk_delete_tickets" and not result.get("ticket_ids"):
+            result["ticket_ids"] = extract_ticket_ids(query)
+        if result.get("intent") == "bulk_create_tickets" and not result.get("titles"):
+            result["titles"] = extract_titles_and_assignee(query)["titles"]
         return result
     except Exception:
         pass
     try:
         # Fallback to previous regex-based extraction if not valid JSON
-        intent_match = re.search(r"Intent:\s*([^\n]+)", content, re.IGNORECASE)
-        title_match = re.search(r"Title:\s*([^\n]+)", content, re.IGNORECASE)
-        assignee_match = re.search(r"Assignee:\s*([^\n]+)", content, re.IGNORECASE)
-        ticket_id_match = re.search(r"ticket_id\s*[:=]\s*(I?\d+)", content, re.IGNORECASE)
+        intent_match = _FALLBACK_INTENT.search(content)
+        title_match = _FALLBACK_TITLE.search(content)
+        assignee_match = _FALLBACK_ASSIGNEE.search(content)
+        ticket_id_match = _FALLBACK_TICKET_ID.search(content)
         intent = intent_match.group(1).strip() if intent_match else None
         title = title_match.group(1).strip() if title_match else None
         assignee = assignee_match.group(1).strip() if assignee_match else None
@@ -122,7 +467,10 @@ def detect_intent(query: str) -> Optional[Dict[str, Any]]:
             extracted = extract_title_and_assignee(query)
             title = title or extracted["title"]
             assignee = assignee or extracted["assignee"]
-        if intent and intent.lower() in {k.lower() for k in INTENTS}:
+        if intent and intent.lower() in ("bulk_create_tickets", "bulk_delete_tickets"):
+            # Lists don't survive the line-based fallback; use the local extractors
+            return classify_bulk(query)
+        if intent and intent.lower() in _INTENT_NAMES:
             result = {"intent": intent.lower()}
             if title:
                 result["title"] = title
@@ -136,7 +484,8 @@ def detect_intent(query: str) -> Optional[Dict[str, Any]]:
     return None
 
 if __name__ == "__main__":
+    import asyncio
     message = "Delete ticket with ID I2378"
-    print(detect_intent(message))
+    print(asyncio.run(detect_intent(message)))
     # message = 'Create a ticket called "Fix login bug" and assign it to me'
-    # print(detect_intent(message))
+    # print(asyncio.run(detect_intent(message)))
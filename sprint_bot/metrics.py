@@ -0,0 +1,163 @@
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+
+class LatencyStats:
+    """
+    Rolling latency summary: lifetime count/mean/max plus percentiles over the
+    most recent ``window`` samples, so memory stays constant under load.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def percentile(self, q: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 2),
+            "p99_ms": round(self.percentile(0.99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+# Upper bounds (seconds) for latency histograms; covers local work through slow upstreams
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+Collector = Callable[[], Iterable[Tuple[str, Dict[str, Any], float]]]
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and two increments."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        running, out = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            out.append((bound, running))
+        return out
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, le: Optional[str] = None) -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if le is not None:
+        parts.append(f'le="{le}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and histograms, rendered in the Prometheus text
+    format by ``render()``. Gauges that already live elsewhere (cache hit
+    counts, queue depths) are read at scrape time through collectors rather
+    than being mirrored on every update.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._collectors: List[Collector] = []
+
+    def observe(self, name: str, value: float, **labels):
+        series = self._histograms.setdefault(name, {})
+        key = _labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+    def incr(self, name: str, amount: float = 1, **labels):
+        series = self._counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + amount
+
+    def counter(self, name: str, **labels) -> float:
+        return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def register_collector(self, collector: Collector):
+        """``collector()`` yields (name, labels, value) gauge samples at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, series in sorted(self._histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in series.items():
+                for bound, count in histogram.cumulative():
+                    lines.append(f"{name}_bucket{_format_labels(labels, le=str(bound))} {count}")
+                lines.append(f"{name}_bucket{_format_labels(labels, le='+Inf')} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for name, series in sorted(self._counters.items()):
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in series.items():
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        gauges: Dict[str, List[str]] = {}
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception:
+                logger.exception("Metrics collector failed")
+                continue
+            for name, labels, value in samples:
+                gauges.setdefault(name, []).append(f"{name}{_format_labels(_labels(labels))} {value}")
+        for name, samples in sorted(gauges.items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
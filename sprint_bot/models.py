@@ -0,0 +1,92 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# Positions of the fields we use in a Zoho itemJObj row
+ITEM_SCHEMA = {
+    "title": 0,
+    "item_no": 1,
+    "created_by": 2,
+    "status": 26,
+    "assignees": 31,
+}
+
+UNKNOWN = "Unknown"
+
+
+def _intern(value: Any) -> Optional[str]:
+    return sys.intern(str(value)) if value is not None else None
+
+
+class Directory:
+    """
+    Shared id -> display name lookups for users and statuses.
+
+    Tickets only hold (interned) ids and resolve names through the directory
+    when they are rendered, so thousands of tickets share one copy of each
+    name and a renamed user or status shows up without re-parsing tickets.
+    """
+
+    def __init__(self):
+        self.users: Dict[str, str] = {}
+        self.statuses: Dict[str, str] = {}
+
+    def update_users(self, users: Optional[Mapping[str, str]]):
+        for user_id, name in (users or {}).items():
+            self.users[_intern(user_id)] = sys.intern(name)
+
+    def update_statuses(self, statuses: Optional[Mapping[str, str]]):
+        for status_id, name in (statuses or {}).items():
+            self.statuses[_intern(status_id)] = sys.intern(name)
+
+    def user_name(self, user_id: Optional[str]) -> str:
+        return self.users.get(user_id, UNKNOWN)
+
+    def status_name(self, status_id: Optional[str]) -> str:
+        return self.statuses.get(status_id, UNKNOWN)
+
+
+@dataclass(slots=True, eq=False)
+class Ticket:
+    id: str
+    title: str
+    item_no: str
+    status_id: Optional[str]
+    created_by_id: Optional[str]
+    assignee_ids: Tuple[str, ...]
+    directory: Directory = field(repr=False)
+
+    @classmethod
+    def from_row(cls, ticket_id: str, row: list, directory: Directory) -> "Ticket":
+        return cls(
+            id=_intern(ticket_id),
+            title=row[ITEM_SCHEMA["title"]],
+            item_no=str(row[ITEM_SCHEMA["item_no"]]),
+            status_id=_intern(row[ITEM_SCHEMA["status"]]),
+            created_by_id=_intern(row[ITEM_SCHEMA["created_by"]]),
+            assignee_ids=tuple(_intern(user_id) for user_id in row[ITEM_SCHEMA["assignees"]] or ()),
+            directory=directory,
+        )
+
+    @property
+    def status(self) -> str:
+        return self.directory.status_name(self.status_id)
+
+    @property
+    def created_by(self) -> str:
+        return self.directory.user_name(self.created_by_id)
+
+    @property
+    def assigned_to(self) -> Dict[str, str]:
+        return {user_id: self.directory.user_name(user_id) for user_id in self.assignee_ids}
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Same shape the API returned before tickets were modelled
+        return {
+            "id": self.id,
+            "title": self.title,
+            "item_no": self.item_no,
+            "status": self.status,
+            "created_by": self.created_by,
+            "assigned_to": self.assigned_to,
+        }
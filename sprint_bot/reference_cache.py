@@ -0,0 +1,133 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+Loader = Callable[[], Awaitable[Any]]
+
+# How long past its TTL a value is still served when reloading it fails
+# (e.g. Zoho is down or its circuit is open)
+REFERENCE_MAX_STALE = float(os.environ.get("REFERENCE_MAX_STALE", "86400"))
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "expires_at")
+
+    def __init__(self, value: Any, ttl: float):
+        self.value = value
+        self.fetched_at = time.monotonic()
+        self.expires_at = self.fetched_at + ttl
+
+
+class ReferenceCache:
+    """
+    Cache for slow-changing Zoho reference data (current sprint, sprint users,
+    statuses).
+
+    Every key has its own loader and TTL. Once an entry is older than
+    ``refresh_ahead`` of its TTL, readers still get the cached value while a
+    refresh runs in the background, so hot requests don't wait on Zoho. Only
+    a cold or fully expired entry makes the caller wait, and concurrent callers
+    share a single in-flight load. Loaders returning ``None`` are treated as
+    failures and are not cached; when a load fails the last good value is
+    served for up to ``max_stale`` seconds past its expiry.
+    """
+
+    def __init__(self, refresh_ahead: float = 0.8, max_stale: float = REFERENCE_MAX_STALE):
+        self.refresh_ahead = refresh_ahead
+        self.max_stale = max_stale
+        self._loaders: Dict[str, Loader] = {}
+        self._ttls: Dict[str, float] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        self._entries: Dict[str, _Entry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.stale_served = 0
+
+    def register(self, name: str, loader: Loader, ttl: float, dependents: Optional[List[str]] = None):
+        """
+        Register a cached value. ``dependents`` are invalidated whenever this
+        value changes (e.g. sprint users when the current sprint rolls over).
+        """
+        self._loaders[name] = loader
+        self._ttls[name] = ttl
+        self._dependents[name] = list(dependents or [])
+
+    async def get(self, name: str) -> Any:
+        entry = self._entries.get(name)
+        now = time.monotonic()
+        if entry is not None and now < entry.expires_at:
+            self.hits += 1
+            refresh_at = entry.fetched_at + self._ttls[name] * self.refresh_ahead
+            if now >= refresh_at and name not in self._inflight:
+                self.refreshes += 1
+                self._start_load(name)
+            return entry.value
+
+        self.misses += 1
+        task = self._inflight.get(name) or self._start_load(name)
+        # shield so a cancelled caller doesn't cancel the load other callers share
+        return await asyncio.shield(task)
+
+    def set(self, name: str, value: Any):
+        """Store a value directly, e.g. from a webhook or after a write."""
+        old = self._entries.get(name)
+        self._entries[name] = _Entry(value, self._ttls.get(name, 0))
+        if old is not None and old.value != value:
+            for dependent in self._dependents.get(name, []):
+                self.invalidate(dependent)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drop one entry (and its dependents), or everything when name is None."""
+        if name is None:
+            self._entries.clear()
+            return
+        self._entries.pop(name, None)
+        for dependent in self._dependents.get(name, []):
+            self.invalidate(dependent)
+
+    def _start_load(self, name: str) -> asyncio.Task:
+        task = asyncio.create_task(self._load(name))
+        self._inflight[name] = task
+        task.add_done_callback(lambda _: self._inflight.pop(name, None))
+        return task
+
+    async def _load(self, name: str) -> Any:
+        try:
+            value = await self._loaders[name]()
+        except Exception:
+            logger.exception(f"Failed to load reference data '{name}'")
+            value = None
+        if value is None:
+            # Keep serving the last good value, even a while past its expiry
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            now = time.monotonic()
+            if now < entry.expires_at:
+                return entry.value
+            if now < entry.expires_at + self.max_stale:
+                self.stale_served += 1
+                logger.warning(f"Serving stale reference data '{name}' ({now - entry.fetched_at:.0f}s old)")
+                return entry.value
+            return None
+        self.set(name, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "background_refreshes": self.refreshes,
+            "stale_served": self.stale_served,
+            "entries": len(self._entries),
+        }
+
+    async def aclose(self):
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
@@ -0,0 +1,265 @@
+import asyncio
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from loguru import logger
+
+from sprint_bot.metrics import LatencyStats, metrics
+
+# Consecutive failures that open an endpoint's circuit
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5"))
+# Seconds an open circuit fails fast before letting a single trial call through
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get("CIRCUIT_RESET_TIMEOUT", "30"))
+# Attempts per call (first try included) for calls that are safe to repeat
+RETRY_MAX_ATTEMPTS = int(os.environ.get("RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.environ.get("RETRY_BASE_DELAY", "0.2"))
+RETRY_MAX_DELAY = float(os.environ.get("RETRY_MAX_DELAY", "2"))
+# No retry is started once a call has been running this long
+UPSTREAM_DEADLINE = float(os.environ.get("UPSTREAM_DEADLINE", "15"))
+# A hedged call still running after this long gets a second copy; once an
+# endpoint has enough samples its recent p95 is used instead. 0 disables hedging
+HEDGE_DELAY = float(os.environ.get("HEDGE_DELAY", "0.5"))
+HEDGE_MIN_DELAY = float(os.environ.get("HEDGE_MIN_DELAY", "0.05"))
+HEDGE_MIN_SAMPLES = 20
+
+T = TypeVar("T")
+
+
+class UpstreamUnavailable(Exception):
+    """Raised when a call is short-circuited by an open breaker or runs out of retries."""
+
+    def __init__(self, message: str, endpoint: str):
+        super().__init__(message)
+        self.endpoint = endpoint
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    # "Full jitter": spreads retries from many callers instead of syncing them up
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after ``failure_threshold`` consecutive failures. While
+    open, calls are refused for ``reset_timeout`` seconds; then one trial
+    call is let through (half-open) and its outcome closes or re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info(f"Circuit {self.name} closed")
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial or (self.opened_at is None and self.failures >= self.failure_threshold):
+            if self.opened_at is None:
+                self.times_opened += 1
+                logger.warning(f"Circuit {self.name} opened after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+        self._trial = False
+
+    def release(self):
+        # The trial call was cancelled before it got an answer; let another one try
+        self._trial = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, "times_opened": self.times_opened}
+
+
+class ResiliencePolicy:
+    """
+    Failure handling for one upstream (OpenAI, or one tenant's Zoho). Every endpoint
+    gets its own circuit breaker and latency window; ``call`` runs an
+    attempt under the breaker with jittered retries, and can hedge slow
+    idempotent calls by racing a second copy. Callers decide what counts as
+    a failure; a failed result is returned after the last attempt (so status
+    handling stays with the caller), a failed exception becomes
+    UpstreamUnavailable.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        deadline: float = UPSTREAM_DEADLINE,
+        hedge_delay: float = HEDGE_DELAY,
+        labels: Optional[Dict[str, str]] = None,
+    ):
+        self.name = name
+        # Extra metric labels, e.g. the tenant a Zoho policy belongs to
+        self.labels = dict(labels or {})
+        self.display = f"{name}[{','.join(self.labels.values())}]" if self.labels else name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, LatencyStats] = {}
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.short_circuited = 0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(f"{self.display} {endpoint}", self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def is_open(self, endpoint: str) -> bool:
+        breaker = self._breakers.get(endpoint)
+        return breaker is not None and breaker.state == "open"
+
+    def _hedge_after(self, endpoint: str) -> float:
+        latency = self._latency.get(endpoint)
+        if latency is None or latency.count < HEDGE_MIN_SAMPLES:
+            return self.hedge_delay
+        return max(HEDGE_MIN_DELAY, latency.percentile(0.95))
+
+    async def _timed(self, endpoint: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        result = await attempt()
+        self._latency.setdefault(endpoint, LatencyStats(window=256)).observe(time.perf_counter() - start)
+        return result
+
+    async def _hedged(self, endpoint: str, attempt: Callable[[], Awaitable[T]], is_failure: Callable[[T], bool]) -> T:
+        first = asyncio.create_task(self._timed(endpoint, attempt))
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self._hedge_after(endpoint))
+            if done:
+                return first.result()
+            self.hedges += 1
+            metrics.incr("sprintbot_upstream_hedges_total", upstream=self.name, **self.labels)
+            second = asyncio.create_task(self._timed(endpoint, attempt))
+            pending.add(second)
+            outcome = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    outcome = task
+                    if task.exception() is None and not is_failure(task.result()):
+                        if task is second:
+                            self.hedge_wins += 1
+                        return task.result()
+            # Both copies failed; report the one that finished last
+            return outcome.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(
+        self,
+        endpoint: str,
+        attempt: Callable[[], Awaitable[T]],
+        *,
+        retry: bool = True,
+        hedge: bool = False,
+        is_failure: Optional[Callable[[T], bool]] = None,
+        is_error: Optional[Callable[[Exception], bool]] = None,
+        retry_error: Optional[Callable[[Exception], bool]] = None,
+    ) -> T:
+        """
+        Run ``attempt()`` for ``endpoint``.
+
+        ``is_failure(result)`` marks failed results (e.g. 5xx responses) and
+        ``is_error(exc)`` the exceptions that mean the upstream is in trouble
+        (default: all); other exceptions propagate untouched. Failures are
+        retried when ``retry`` is set, exceptions also when ``retry_error``
+        says so (e.g. a connect error on a non-idempotent call). ``hedge`` is
+        only for calls that are safe to send twice.
+        """
+        is_failure = is_failure or (lambda result: False)
+        is_error = is_error or (lambda error: True)
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            self.short_circuited += 1
+            metrics.incr("sprintbot_circuit_rejections_total", upstream=self.name, **self.labels)
+            raise UpstreamUnavailable(f"{self.display} {endpoint} is unavailable (circuit open)", endpoint)
+
+        start = time.monotonic()
+        attempt_no = 0
+        while True:
+            attempt_no += 1
+            error: Optional[Exception] = None
+            try:
+                if hedge and self.hedge_delay > 0 and breaker.state == "closed":
+                    result = await self._hedged(endpoint, attempt, is_failure)
+                else:
+                    result = await self._timed(endpoint, attempt)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                if not is_error(e):
+                    # The upstream answered; the request itself was bad
+                    breaker.record_success()
+                    raise
+                error = e
+            if error is None and not is_failure(result):
+                breaker.record_success()
+                return result
+
+            breaker.record_failure()
+            can_retry = retry if error is None or retry_error is None else retry_error(error)
+            delay = backoff_delay(attempt_no)
+            if (
+                not can_retry
+                or attempt_no >= self.max_attempts
+                or time.monotonic() - start + delay >= self.deadline
+                or breaker.state != "closed"
+            ):
+                if error is None:
+                    return result
+                raise UpstreamUnavailable(f"{self.display} {endpoint} failed: {error!r}", endpoint) from error
+            self.retries += 1
+            metrics.incr("sprintbot_upstream_retries_total", upstream=self.name, **self.labels)
+            reason = repr(error) if error is not None else "failed response"
+            logger.warning(f"{self.display} {endpoint} failed ({reason}); retry {attempt_no} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "short_circuited": self.short_circuited,
+            "endpoints": {
+                endpoint: {**breaker.stats(), "latency": self._latency[endpoint].snapshot() if endpoint in self._latency else None}
+                for endpoint, breaker in self._breakers.items()
+            },
+        }
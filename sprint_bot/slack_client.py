@@ -0,0 +1,238 @@
+import asyncio
+import os
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from cachetools import TTLCache
+from loguru import logger
+
+from sprint_bot.metrics import LatencyStats
+from sprint_bot.tracing import preview, record_error, span
+
+SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
+SLACK_API_BASE_URL = os.environ.get("SLACK_API_BASE_URL", "https://slack.com/api")
+
+SLACK_TIMEOUT = float(os.environ.get("SLACK_TIMEOUT", "5"))
+SLACK_MAX_CONNECTIONS = int(os.environ.get("SLACK_MAX_CONNECTIONS", "20"))
+# chat.postMessage allows roughly one message per second per channel, with short bursts
+SLACK_CHANNEL_RATE = float(os.environ.get("SLACK_CHANNEL_RATE", "1"))
+SLACK_CHANNEL_BURST = float(os.environ.get("SLACK_CHANNEL_BURST", "3"))
+SLACK_MAX_ATTEMPTS = int(os.environ.get("SLACK_MAX_ATTEMPTS", "4"))
+# An ack is held this long so a fast result can replace it (one message instead of two)
+SLACK_ACK_DELAY = float(os.environ.get("SLACK_ACK_DELAY", "0.3"))
+
+RETRYABLE_ERRORS = {"ratelimited", "service_unavailable", "request_timeout", "internal_error", "fatal_error"}
+
+
+class TokenBucket:
+    """Per-channel send budget that can also be paused by a Retry-After."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class PendingAck:
+    """Handle for a delayed acknowledgement that a reply may replace."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.delivering = False
+
+
+class SlackSender:
+    """
+    Async chat.postMessage delivery.
+
+    Uses one pooled HTTP client, a token bucket per channel (paused by Slack's
+    Retry-After on 429s), and retries transient failures with jittered
+    exponential backoff. Messages to a channel go out in order. Acks are
+    delayed briefly and dropped if the real reply is ready first.
+    """
+
+    def __init__(
+        self,
+        base_url: str = SLACK_API_BASE_URL,
+        token: Optional[str] = SLACK_BOT_TOKEN,
+        rate: float = SLACK_CHANNEL_RATE,
+        burst: float = SLACK_CHANNEL_BURST,
+        max_attempts: int = SLACK_MAX_ATTEMPTS,
+        ack_delay: float = SLACK_ACK_DELAY,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.rate = rate
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self.ack_delay = ack_delay
+        self._client: Optional[httpx.AsyncClient] = None
+        self._buckets = TTLCache(maxsize=10000, ttl=3600)
+        self._profiles = TTLCache(maxsize=10000, ttl=3600)
+        self.latency = LatencyStats()
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.coalesced = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=SLACK_TIMEOUT,
+                limits=httpx.Limits(max_connections=SLACK_MAX_CONNECTIONS),
+                headers={"Authorization": f"Bearer {self.token}"},
+            )
+        return self._client
+
+    def _bucket(self, channel: str) -> TokenBucket:
+        bucket = self._buckets.get(channel)
+        if bucket is None:
+            bucket = self._buckets[channel] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    async def send(self, channel: str, text: str, ack: Optional[PendingAck] = None) -> bool:
+        """
+        Post ``text`` to ``channel``. If ``ack`` hasn't gone out yet it is
+        cancelled and only this message is sent. Returns True once Slack accepts it.
+        """
+        if ack is not None:
+            if not ack.delivering and not ack.task.done():
+                ack.task.cancel()
+                self.coalesced += 1
+            else:
+                # Already on the wire; let it land first so replies stay in order
+                await asyncio.gather(ack.task, return_exceptions=True)
+        start = time.perf_counter()
+        bucket = self._bucket(channel)
+        with span("slack"):
+            async with bucket.lock:
+                delivered = await self._deliver(bucket, channel, text)
+        self.latency.observe(time.perf_counter() - start)
+        if not delivered:
+            record_error("slack")
+        return delivered
+
+    def ack(self, channel: str, text: str) -> PendingAck:
+        """Schedule an acknowledgement; pass the handle to ``send`` for the result."""
+        async def _send_later():
+            await asyncio.sleep(self.ack_delay)
+            pending.delivering = True
+            await self.send(channel, text)
+
+        pending = PendingAck(asyncio.create_task(_send_later()))
+        return pending
+
+    async def _deliver(self, bucket: TokenBucket, channel: str, text: str) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            await bucket.acquire()
+            retry_after = None
+            try:
+                response = await self._get_client().post("/chat.postMessage", json={"channel": channel, "text": text})
+                if response.status_code == 429:
+                    self.rate_limited += 1
+                    retry_after = float(response.headers.get("Retry-After", "1"))
+                    bucket.pause(retry_after)
+                    error = "ratelimited"
+                elif response.status_code >= 500:
+                    error = f"http_{response.status_code}"
+                else:
+                    body = response.json()
+                    if not isinstance(body, dict):
+                        raise ValueError(f"unexpected response body {preview(body)}")
+                    if body.get("ok"):
+                        self.sent += 1
+                        return True
+                    error = body.get("error", "unknown_error")
+                    if error not in RETRYABLE_ERRORS:
+                        logger.error(f"Slack rejected message to {channel}: {error}")
+                        break
+            except (httpx.HTTPError, ValueError) as e:
+                # ValueError: not a Slack API answer, e.g. an HTML error page from a proxy
+                error = repr(e)
+            if attempt < self.max_attempts:
+                self.retries += 1
+                delay = retry_after if retry_after is not None else min(8.0, 0.25 * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                logger.warning(f"Slack send to {channel} failed ({error}); retry {attempt} in {delay:.2f}s")
+                if retry_after is None:
+                    await asyncio.sleep(delay)
+        self.failed += 1
+        return False
+
+    async def user_profile(self, user_id: str) -> Optional[Dict[str, Optional[str]]]:
+        """Look up a Slack user's real name and email (users.info), cached for an hour."""
+        if user_id in self._profiles:
+            return self._profiles[user_id]
+        try:
+            with span("slack_users_info"):
+                response = await self._get_client().get("/users.info", params={"user": user_id})
+            body = response.json()
+        except (httpx.HTTPError, ValueError):
+            logger.exception(f"Slack users.info failed for {user_id}")
+            return None
+        if not body.get("ok"):
+            logger.warning(f"Slack users.info for {user_id} returned {body.get('error')}")
+            return None
+        user = body.get("user", {})
+        profile = user.get("profile", {})
+        # email is only present with the users:read.email scope
+        result = {
+            "real_name": user.get("real_name") or profile.get("real_name") or user.get("name"),
+            "email": profile.get("email"),
+        }
+        self._profiles[user_id] = result
+        return result
+
+    async def warm_up(self) -> bool:
+        """Open a pooled connection to Slack (auth.test) and check the bot token."""
+        try:
+            with span("slack_auth_test"):
+                response = await self._get_client().post("/auth.test")
+            body = response.json()
+        except (httpx.HTTPError, ValueError):
+            logger.exception("Slack auth.test failed")
+            return False
+        if not body.get("ok"):
+            logger.warning(f"Slack auth.test returned {body.get('error')}")
+            return False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "coalesced_acks": self.coalesced,
+            "latency": self.latency.snapshot(),
+        }
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+slack_sender = SlackSender()
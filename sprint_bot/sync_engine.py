@@ -0,0 +1,249 @@
+import asyncio
+import os
+import time
+from contextlib import aclosing
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from loguru import logger
+
+from sprint_bot.ticket_store import TicketStore
+from sprint_bot.tickets import iter_tickets
+from sprint_bot.tracing import use_trace
+from sprint_bot.zoho_client import ZohoAPIError, ZohoClient
+
+SYNC_INTERVAL = float(os.environ.get("SYNC_INTERVAL", "30"))
+SYNC_MAX_STALENESS = float(os.environ.get("SYNC_MAX_STALENESS", "60"))
+# Delta pulls can't see deletions made outside the bot, so resync fully now and then
+SYNC_FULL_INTERVAL = float(os.environ.get("SYNC_FULL_INTERVAL", "900"))
+# Query parameter Zoho uses to filter items by last-modified time (epoch millis)
+ZOHO_MODIFIED_SINCE_PARAM = os.environ.get("ZOHO_MODIFIED_SINCE_PARAM", "modifiedafter")
+# A delta returning at least this share of a sprint of at least
+# SYNC_DELTA_CHECK_MIN tickets means Zoho ignored the modified-since filter
+SYNC_DELTA_IGNORED_RATIO = float(os.environ.get("SYNC_DELTA_IGNORED_RATIO", "0.9"))
+SYNC_DELTA_CHECK_MIN = int(os.environ.get("SYNC_DELTA_CHECK_MIN", "50"))
+# Overlap between consecutive delta windows to absorb clock skew
+SYNC_CLOCK_SKEW = float(os.environ.get("SYNC_CLOCK_SKEW", "5"))
+# While Zoho webhooks keep arriving the store is patched as changes happen, so
+# polling backs off to these; PUSH_WINDOW is how long after the last webhook
+# they're trusted to still be flowing
+SYNC_PUSH_INTERVAL = float(os.environ.get("SYNC_PUSH_INTERVAL", "300"))
+SYNC_PUSH_MAX_STALENESS = float(os.environ.get("SYNC_PUSH_MAX_STALENESS", "900"))
+SYNC_PUSH_WINDOW = float(os.environ.get("SYNC_PUSH_WINDOW", "1800"))
+# When a sync fails (Zoho down, circuit open), reads keep getting the last
+# good snapshot for up to this many seconds instead of an error
+SYNC_MAX_STALE_SERVE = float(os.environ.get("SYNC_MAX_STALE_SERVE", "3600"))
+
+# What the current-sprint lookup returns when the project has no active
+# sprint; None means the lookup itself failed
+NO_ACTIVE_SPRINT = ""
+
+
+class SprintSync:
+    """
+    Keeps a TicketStore in step with Zoho.
+
+    The first sync (and one every ``full_interval`` seconds, or when the sprint
+    rolls over) downloads the whole sprint. In between, only items modified
+    since the last watermark are pulled and merged, so Zoho traffic follows
+    ticket churn instead of request volume. Reads go through ``ensure_fresh``,
+    which only waits on Zoho when the snapshot is older than ``max_staleness``;
+    the background loop normally keeps it well inside that bound.
+
+    If a delta comes back with (nearly) the whole sprint, Zoho isn't applying
+    the modified-since filter; polling then falls back to a full sync every
+    ``full_interval`` seconds rather than downloading everything each
+    ``interval``.
+    """
+
+    def __init__(
+        self,
+        client: ZohoClient,
+        store: TicketStore,
+        get_sprint_id: Callable[[], Awaitable[Optional[str]]],
+        get_statuses: Callable[[], Awaitable[Dict[str, str]]],
+        items_path: Callable[[str], str],
+        interval: float = SYNC_INTERVAL,
+        max_staleness: float = SYNC_MAX_STALENESS,
+        full_interval: float = SYNC_FULL_INTERVAL,
+    ):
+        self.client = client
+        self.store = store
+        self.get_sprint_id = get_sprint_id
+        self.get_statuses = get_statuses
+        self.items_path = items_path
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self.full_interval = full_interval
+        self.last_sync: Optional[float] = None
+        self.last_good_sync: Optional[float] = None
+        self.last_full_sync: Optional[float] = None
+        self.watermark_ms: Optional[int] = None
+        self.delta_unsupported = False
+        self.last_push: Optional[float] = None
+        self.pushes = 0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.full_syncs = 0
+        self.delta_syncs = 0
+        self.items_merged = 0
+        self.failures = 0
+        self.stale_served = 0
+
+    def staleness(self) -> float:
+        return time.monotonic() - self.last_sync if self.last_sync is not None else float("inf")
+
+    def record_push(self):
+        """Note that a webhook just patched the store (see sprint_bot.webhooks)."""
+        self.last_push = time.monotonic()
+        self.pushes += 1
+
+    def push_active(self) -> bool:
+        return self.last_push is not None and time.monotonic() - self.last_push < SYNC_PUSH_WINDOW
+
+    async def ensure_fresh(self, max_staleness: Optional[float] = None) -> TicketStore:
+        """
+        Return the store, syncing first if it is older than ``max_staleness``
+        (default: the engine's bound). If that sync fails, the previous
+        snapshot is returned as long as it's under SYNC_MAX_STALE_SERVE old;
+        otherwise ZohoAPIError is raised.
+        """
+        bound = self.max_staleness if max_staleness is None else max_staleness
+        if self.push_active():
+            bound = max(bound, SYNC_PUSH_MAX_STALENESS)
+        if self.staleness() > bound:
+            async with self._lock:
+                # Someone else may have synced while we waited for the lock
+                if self.staleness() > bound:
+                    try:
+                        await self._sync_locked()
+                    except ZohoAPIError:
+                        if not self._can_serve_stale():
+                            raise
+                        self.stale_served += 1
+                        logger.warning(f"Sync failed; serving a snapshot from {time.monotonic() - self.last_good_sync:.0f}s ago")
+        return self.store
+
+    def _can_serve_stale(self) -> bool:
+        return (
+            self.store.loaded
+            and self.last_good_sync is not None
+            and time.monotonic() - self.last_good_sync < SYNC_MAX_STALE_SERVE
+        )
+
+    def mark_stale(self):
+        """Force the next ensure_fresh() to sync, e.g. after a write we couldn't index."""
+        self.last_sync = None
+
+    async def sync(self, full: bool = False):
+        async with self._lock:
+            await self._sync_locked(full)
+
+    async def _sync_locked(self, full: bool = False):
+        sprint_id = await self.get_sprint_id()
+        if sprint_id is None:
+            # Zoho is down and there's no sprint to fall back on; an empty
+            # store here would look like a sprint without tickets
+            self.failures += 1
+            raise ZohoAPIError("Could not look up the current sprint.")
+        if sprint_id == NO_ACTIVE_SPRINT:
+            # No active sprint: nothing to serve
+            self.store.replace_all(None, [])
+            self.last_sync = self.last_good_sync = time.monotonic()
+            return
+        statuses = await self.get_statuses()
+        self.store.directory.update_statuses(statuses)
+        now = time.monotonic()
+        needs_full = (
+            full
+            or not self.store.loaded
+            or self.store.sprint_id != sprint_id
+            or self.watermark_ms is None
+            or self.delta_unsupported
+            or self.last_full_sync is None
+            or now - self.last_full_sync > self.full_interval
+        )
+        # Everything modified from here on is picked up by the next delta
+        window_start_ms = int((time.time() - SYNC_CLOCK_SKEW) * 1000)
+        try:
+            if needs_full:
+                await self._full_sync(sprint_id)
+            else:
+                await self._delta_sync(sprint_id)
+        except Exception:
+            self.failures += 1
+            raise
+        self.watermark_ms = window_start_ms
+        self.last_sync = self.last_good_sync = time.monotonic()
+
+    async def _full_sync(self, sprint_id: str):
+        path = self.items_path(sprint_id)
+        async with aclosing(iter_tickets(self.client, path, self.store.directory)) as tickets:
+            snapshot = [ticket async for ticket in tickets]
+        self.store.replace_all(sprint_id, snapshot)
+        self.full_syncs += 1
+        self.last_full_sync = time.monotonic()
+        logger.info(f"Full sync of sprint {sprint_id}: {len(snapshot)} tickets")
+        if self.store.dropped:
+            logger.warning(f"Sprint {sprint_id} exceeds the ticket cap of {self.store.max_tickets}; {self.store.dropped} tickets not kept")
+
+    async def _delta_sync(self, sprint_id: str):
+        path = self.items_path(sprint_id)
+        params = {ZOHO_MODIFIED_SINCE_PARAM: self.watermark_ms}
+        size = len(self.store)
+        merged = 0
+        async with aclosing(iter_tickets(self.client, path, self.store.directory, params=params)) as tickets:
+            async for ticket in tickets:
+                self.store.upsert(ticket)
+                merged += 1
+        self.delta_syncs += 1
+        self.items_merged += merged
+        if merged:
+            logger.info(f"Delta sync of sprint {sprint_id}: merged {merged} tickets")
+        if size >= SYNC_DELTA_CHECK_MIN and merged >= size * SYNC_DELTA_IGNORED_RATIO:
+            self.delta_unsupported = True
+            logger.warning(
+                f"Delta sync of sprint {sprint_id} returned {merged} of {size} tickets; Zoho seems to ignore "
+                f"{ZOHO_MODIFIED_SINCE_PARAM!r}. Falling back to a full sync every {self.full_interval:.0f}s"
+            )
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        # Started from whichever request activated the tenant; don't inherit its trace
+        with use_trace(None):
+            while True:
+                try:
+                    await self.sync()
+                except Exception:
+                    logger.exception("Background sprint sync failed")
+                await asyncio.sleep(self.poll_interval())
+
+    def poll_interval(self) -> float:
+        if self.delta_unsupported:
+            return max(self.interval, self.full_interval)
+        if self.push_active():
+            return max(self.interval, SYNC_PUSH_INTERVAL)
+        return self.interval
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tickets": len(self.store),
+            "dropped_tickets": self.store.dropped,
+            "staleness_s": round(self.staleness(), 2) if self.last_sync is not None else None,
+            "full_syncs": self.full_syncs,
+            "delta_syncs": self.delta_syncs,
+            "items_merged": self.items_merged,
+            "delta_unsupported": self.delta_unsupported,
+            "failures": self.failures,
+            "stale_served": self.stale_served,
+            "webhook_pushes": self.pushes,
+            "push_active": self.push_active(),
+        }
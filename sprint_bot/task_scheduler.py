@@ -0,0 +1,178 @@
+import asyncio
+import contextvars
+import itertools
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from sprint_bot.metrics import LatencyStats
+
+INTENT_WORKERS = int(os.environ.get("INTENT_WORKERS", "4"))
+INTENT_QUEUE_SIZE = int(os.environ.get("INTENT_QUEUE_SIZE", "1000"))
+INTENT_DEFAULT_TIMEOUT = float(os.environ.get("INTENT_DEFAULT_TIMEOUT", "30"))
+
+# Lower runs first: cheap reads go ahead of Zoho writes
+INTENT_PRIORITIES = {
+    "bot_capabilities": 0,
+    "get_my_tickets": 1,
+    "create_ticket": 5,
+    "delete_ticket": 5,
+    "bulk_create_tickets": 6,
+    "bulk_delete_tickets": 6,
+}
+
+# Seconds a job may run before it is cancelled
+INTENT_TIMEOUTS = {
+    "bot_capabilities": 5.0,
+    "get_my_tickets": 20.0,
+    "create_ticket": 30.0,
+    "delete_ticket": 30.0,
+    "bulk_create_tickets": 120.0,
+    "bulk_delete_tickets": 120.0,
+}
+
+JobFactory = Callable[[], Awaitable[Any]]
+FailureHandler = Callable[[BaseException], Awaitable[Any]]
+
+
+@dataclass(order=True, slots=True)
+class Job:
+    priority: int
+    seq: int
+    kind: str = field(compare=False)
+    factory: JobFactory = field(compare=False)
+    on_failure: Optional[FailureHandler] = field(compare=False, default=None)
+    submitted_at: float = field(compare=False, default_factory=time.monotonic)
+    # The submitter's context (trace id etc.), which the job runs in
+    context: contextvars.Context = field(compare=False, default_factory=contextvars.copy_context)
+
+
+class TaskScheduler:
+    """
+    Runs intent jobs on a fixed number of workers.
+
+    Jobs are ordered by priority (see INTENT_PRIORITIES), then by submission
+    order, and cancelled after their per-kind timeout. Workers hold strong
+    references to what they run, so nothing is garbage-collected mid-flight,
+    and ``stop()`` drains queued and running jobs before returning.
+    """
+
+    def __init__(
+        self,
+        workers: int = INTENT_WORKERS,
+        max_queue: int = INTENT_QUEUE_SIZE,
+        priorities: Optional[Dict[str, int]] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: float = INTENT_DEFAULT_TIMEOUT,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.priorities = priorities if priorities is not None else INTENT_PRIORITIES
+        self.timeouts = timeouts if timeouts is not None else INTENT_TIMEOUTS
+        self.default_timeout = default_timeout
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._seq = itertools.count()
+        self.running = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.latency: Dict[str, LatencyStats] = {}
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, kind: str, factory: JobFactory, on_failure: Optional[FailureHandler] = None) -> bool:
+        """
+        Queue ``factory()`` to run as a ``kind`` job. ``on_failure`` is awaited
+        with the exception if the job raises or times out. Returns False when
+        the queue is full.
+        """
+        if self._queue is None:
+            raise RuntimeError("TaskScheduler.start() has not been called")
+        job = Job(self.priorities.get(kind, max(self.priorities.values(), default=0)), next(self._seq), kind, factory, on_failure)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            logger.warning(f"Intent queue full ({self.max_queue}); rejecting {kind} job")
+            return False
+        self.submitted += 1
+        return True
+
+    async def start(self):
+        if self.started:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self, timeout: float = 30.0):
+        """Wait up to ``timeout`` for queued and running jobs, then stop the workers."""
+        if not self.started:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Scheduler stopped with {self.queued()} queued and {self.running} running jobs")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self._queue.get()
+            self.running += 1
+            timeout = self.timeouts.get(job.kind, self.default_timeout)
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(asyncio.create_task(job.factory(), context=job.context), timeout)
+                self.completed += 1
+            except asyncio.TimeoutError as e:
+                self.timed_out += 1
+                logger.error(f"{job.kind} job timed out after {timeout}s")
+                await self._notify_failure(job, e)
+            except Exception as e:
+                self.failed += 1
+                logger.exception(f"{job.kind} job failed on worker {index}")
+                await self._notify_failure(job, e)
+            finally:
+                self._observe(job.kind, time.perf_counter() - start)
+                self.running -= 1
+                self._queue.task_done()
+
+    async def _notify_failure(self, job: Job, error: BaseException):
+        if job.on_failure is None:
+            return
+        try:
+            await job.on_failure(error)
+        except Exception:
+            logger.exception(f"Failure handler for {job.kind} job raised")
+
+    def _observe(self, kind: str, seconds: float):
+        stats = self.latency.get(kind)
+        if stats is None:
+            stats = self.latency[kind] = LatencyStats()
+        stats.observe(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": self.queued(),
+            "running": self.running,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "latency": {kind: stats.snapshot() for kind, stats in self.latency.items()},
+        }
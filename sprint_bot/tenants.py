@@ -0,0 +1,300 @@
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from sprint_bot.identity import NameIndex
+from sprint_bot.reference_cache import ReferenceCache
+from sprint_bot.resilience import ResiliencePolicy
+from sprint_bot.sync_engine import NO_ACTIVE_SPRINT, SprintSync
+from sprint_bot.ticket_store import TicketStore
+from sprint_bot.tracing import preview
+from sprint_bot.zoho_client import ZOHO_MAX_CONCURRENCY, ZohoClient
+
+# JSON file describing every team served by this deployment (see TenantRegistry.from_file)
+SPRINTBOT_TENANTS_FILE = os.environ.get("SPRINTBOT_TENANTS_FILE")
+
+# Reference data TTLs in seconds; these change roughly once per sprint
+SPRINT_CACHE_TTL = float(os.environ.get("SPRINT_CACHE_TTL", "900"))
+USERS_CACHE_TTL = float(os.environ.get("USERS_CACHE_TTL", "3600"))
+STATUS_CACHE_TTL = float(os.environ.get("STATUS_CACHE_TTL", "3600"))
+# Upper bound on tickets kept in memory per tenant
+TENANT_MAX_TICKETS = int(os.environ.get("TENANT_MAX_TICKETS", "20000"))
+
+
+@dataclass(slots=True)
+class TenantConfig:
+    name: str
+    team_id: str
+    project_id: str
+    item_type_id: str
+    priority_id: str
+    # Zoho user acting for Slack users that aren't in ``users``
+    default_zoho_user: Optional[str] = None
+    # Slack user id -> Zoho user id
+    users: Dict[str, str] = field(default_factory=dict)
+    # Slack workspace (team) ids and channel ids routed to this tenant
+    slack_team_ids: List[str] = field(default_factory=list)
+    slack_channels: List[str] = field(default_factory=list)
+    # Environment variable holding this tenant's Zoho OAuth token
+    access_token_env: str = "ZOHO_ACCESS_TOKEN"
+    # Environment variable holding the secret Zoho signs this tenant's webhooks with
+    webhook_secret_env: str = "ZOHO_WEBHOOK_SECRET"
+    ticket_url_template: str = "https://sprints.zoho.com/workspace/decisiontree#P2/itemdetails/{item_no}"
+    max_tickets: int = TENANT_MAX_TICKETS
+    max_concurrency: int = ZOHO_MAX_CONCURRENCY
+
+
+# The single team SprintBot was originally written for; overridable from the environment
+DEFAULT_TENANT_CONFIG = TenantConfig(
+    name=os.environ.get("SPRINTBOT_TENANT", "default"),
+    team_id=os.environ.get("ZOHO_TEAM_ID", "669462816"),
+    project_id=os.environ.get("ZOHO_PROJECT_ID", "28091000000003109"),
+    item_type_id=os.environ.get("ZOHO_ITEM_TYPE_ID", "28091000000003133"),
+    priority_id=os.environ.get("ZOHO_PRIORITY_ID", "28091000000003121"),
+    # Only used by the /test endpoint; unlinked Slack users are never mapped to it
+    default_zoho_user=os.environ.get("ZOHO_DEFAULT_USER"),
+)
+
+
+class Tenant:
+    """
+    One Zoho team/project served by the bot.
+
+    Each tenant has its own Zoho client (its own token, connection pool and
+    concurrency budget), reference cache, ticket store and sync engine, so a
+    slow or very large project can't starve or evict another tenant's data.
+    """
+
+    def __init__(self, config: TenantConfig):
+        self.config = config
+        self.webhook_secret = os.environ.get(config.webhook_secret_env)
+        self.zoho = ZohoClient(
+            access_token=os.environ.get(config.access_token_env),
+            max_concurrency=config.max_concurrency,
+            policy=ResiliencePolicy("zoho", labels={"tenant": config.name}),
+        )
+        self.reference_cache = ReferenceCache()
+        self.reference_cache.register("current_sprint", self._fetch_current_sprint, SPRINT_CACHE_TTL, dependents=["sprint_users"])
+        self.reference_cache.register("sprint_users", self._fetch_sprint_users, USERS_CACHE_TTL)
+        self.reference_cache.register("statuses", self._fetch_all_status, STATUS_CACHE_TTL)
+        self.ticket_store = TicketStore(max_tickets=config.max_tickets)
+        self.name_index = NameIndex()
+        # Zoho user email (lowercased) -> user id, filled when the sprint roster loads
+        self.user_emails: Dict[str, str] = {}
+        self.sprint_sync = SprintSync(self.zoho, self.ticket_store, self.current_sprint, self.statuses, self.sprint_items_path)
+        self._active = False
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    @property
+    def project_path(self) -> str:
+        return f"/team/{self.config.team_id}/projects/{self.config.project_id}"
+
+    def sprint_items_path(self, sprint_id: str) -> str:
+        return f"{self.project_path}/sprints/{sprint_id}/item/"
+
+    def ticket_url(self, item_no: str) -> str:
+        return self.config.ticket_url_template.format(item_no=item_no)
+
+    async def current_sprint(self):
+        return await self.reference_cache.get("current_sprint")
+
+    async def sprint_users(self):
+        return await self.reference_cache.get("sprint_users")
+
+    async def statuses(self):
+        return await self.reference_cache.get("statuses") or {}
+
+    async def user_index(self) -> NameIndex:
+        # Rebuilt only when the cached roster changes
+        self.name_index.update(await self.sprint_users())
+        return self.name_index
+
+    async def warm_up(self, tickets: bool = False) -> bool:
+        """
+        Load sprint, users and statuses concurrently (which also opens the
+        Zoho connection pool); with ``tickets`` also sync the ticket store and
+        start its background sync. Returns False if anything came back empty.
+        """
+        loads = [self.current_sprint(), self.sprint_users(), self.reference_cache.get("statuses")]
+        if tickets:
+            self.activate()
+            loads.append(self.sprint_sync.ensure_fresh())
+        results = await asyncio.gather(*loads, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"[{self.name}] Warm-up step failed: {result!r}")
+        return all(result is not None and not isinstance(result, Exception) for result in results)
+
+    def user_for_email(self, email: Optional[str]) -> Optional[str]:
+        return self.user_emails.get(email.strip().lower()) if email else None
+
+    def invalidate_reference_data(self, name: Optional[str] = None):
+        """
+        Drop cached sprint/users/statuses so the next read goes to Zoho.
+        Pass a name ("current_sprint", "sprint_users", "statuses") to drop only one.
+        """
+        self.reference_cache.invalidate(name)
+
+    async def _fetch_current_sprint(self):
+        # Call Zoho Sprints API to fetch the current sprint
+        logger.info(f"[{self.name}] Fetching current sprint")
+        response = await self.zoho.get(
+            f"{self.project_path}/sprints/",
+            params={"action": "data", "index": 1, "range": 100, "type": "[2]"},
+        )
+        if response.status_code == 200:
+            data = response.json()
+            logger.opt(lazy=True).debug("Data: {}", lambda: preview(data))
+            sprint_ids = data.get("sprintIds", [])
+            if sprint_ids:
+                return sprint_ids[0]  # Return the first sprint ID
+            else:
+                logger.info("No active sprints found.")
+                # A real answer, so it's cached (unlike None, which means the lookup failed)
+                return NO_ACTIVE_SPRINT
+        else:
+            logger.error(f"Failed to fetch sprints. Status code: {response.status_code}, Response: {preview(response.text)}")
+            return None
+
+    async def _fetch_sprint_users(self):
+        # Call Zoho Sprints API to fetch users in the current sprint
+        logger.info(f"[{self.name}] Fetching sprint users")
+        sprint_id = await self.current_sprint()
+        if sprint_id is None:
+            return None
+        if sprint_id == NO_ACTIVE_SPRINT:
+            return {}
+
+        response = await self.zoho.get(
+            f"{self.project_path}/sprints/{sprint_id}/users/",
+            params={"action": "data", "index": 1, "range": 100},
+        )
+        # With the response, create a dictionary of user IDs and their display names
+        if response.status_code == 200:
+            data = response.json()
+            logger.opt(lazy=True).debug("Data: {}", lambda: preview(data))
+            users = data.get("userJObj", {})
+            user_display_names = {}
+            user_emails = {}
+            for user_id, user_info in users.items():
+                user_display_names[user_id] = user_info[0]
+                # The email's position varies; it's the entry that looks like one
+                email = next((value for value in user_info[1:] if isinstance(value, str) and "@" in value), None)
+                if email:
+                    user_emails[email.strip().lower()] = user_id
+            self.user_emails = user_emails
+            return user_display_names
+        else:
+            logger.error(f"Failed to fetch sprint users. Status code: {response.status_code}, Response: {preview(response.text)}")
+            return None
+
+    async def _fetch_all_status(self):
+        # Call Zoho Sprints API to fetch all status
+        logger.info(f"[{self.name}] Fetching all status")
+        response = await self.zoho.get(
+            f"{self.project_path}/itemstatus/",
+            params={"action": "data", "index": 1, "range": 100},
+        )
+        if response.status_code == 200:
+            data = response.json()
+            logger.opt(lazy=True).debug("Data: {}", lambda: preview(data))
+            statuses = {}
+            for status_id, status_info in data.get("statusJObj", {}).items():
+                statuses[status_id] = status_info[0]  # status name is at index 0
+            return statuses
+        else:
+            logger.error(f"Failed to fetch status. Status code: {response.status_code}, Response: {preview(response.text)}")
+            return None
+
+    def activate(self):
+        # Background sync only runs for tenants that have actually been used
+        if not self._active:
+            self._active = True
+            self.sprint_sync.start()
+
+    async def aclose(self):
+        await self.sprint_sync.stop()
+        await self.reference_cache.aclose()
+        await self.zoho.aclose()
+        self._active = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self._active,
+            "reference_cache": self.reference_cache.stats(),
+            "sprint_sync": self.sprint_sync.stats(),
+        }
+
+
+class TenantRegistry:
+    """
+    Maps incoming Slack traffic to tenants: a configured channel wins over a
+    configured workspace, and anything unmatched goes to the default tenant.
+    """
+
+    def __init__(self, configs: List[TenantConfig], default: Optional[str] = None):
+        if not configs:
+            raise ValueError("At least one tenant must be configured")
+        self._tenants: Dict[str, Tenant] = {}
+        self._by_channel: Dict[str, Tenant] = {}
+        self._by_slack_team: Dict[str, Tenant] = {}
+        for config in configs:
+            if config.name in self._tenants:
+                raise ValueError(f"Duplicate tenant name: {config.name}")
+            tenant = Tenant(config)
+            self._tenants[config.name] = tenant
+            for channel in config.slack_channels:
+                self._by_channel[channel] = tenant
+            for slack_team_id in config.slack_team_ids:
+                self._by_slack_team[slack_team_id] = tenant
+        self.default = self._tenants[default] if default else self._tenants[configs[0].name]
+        self._started = False
+
+    @classmethod
+    def from_file(cls, path: str) -> "TenantRegistry":
+        """
+        Load tenants from a JSON file of the form
+        {"default": "<name>", "tenants": [{<TenantConfig fields>}, ...]}.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        configs = [TenantConfig(**tenant) for tenant in data["tenants"]]
+        return cls(configs, default=data.get("default"))
+
+    @classmethod
+    def from_env(cls) -> "TenantRegistry":
+        if SPRINTBOT_TENANTS_FILE:
+            return cls.from_file(SPRINTBOT_TENANTS_FILE)
+        return cls([DEFAULT_TENANT_CONFIG])
+
+    def get(self, name: Optional[str]) -> Optional[Tenant]:
+        if name is None:
+            return self.default
+        return self._tenants.get(name)
+
+    def resolve(self, slack_team_id: Optional[str] = None, channel: Optional[str] = None) -> Tenant:
+        tenant = self._by_channel.get(channel) or self._by_slack_team.get(slack_team_id) or self.default
+        if self._started:
+            tenant.activate()
+        return tenant
+
+    def __iter__(self) -> Iterator[Tenant]:
+        return iter(self._tenants.values())
+
+    def start(self):
+        self._started = True
+
+    async def aclose(self):
+        for tenant in self._tenants.values():
+            await tenant.aclose()
+        self._started = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: tenant.stats() for name, tenant in self._tenants.items()}
@@ -0,0 +1,110 @@
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sprint_bot.models import Directory, Ticket
+
+
+def normalize_item_no(item_no: Any) -> str:
+    # Users type "I2378", Zoho stores "2378"
+    item_no = str(item_no).strip()
+    if item_no.upper().startswith("I"):
+        item_no = item_no[1:]
+    return item_no.strip()
+
+
+class TicketStore:
+    """
+    In-memory copy of one sprint's tickets with secondary indexes:
+    assignee -> tickets, item_no -> ticket id and status id -> tickets.
+    Display names are resolved through the store's shared ``directory``.
+
+    Index sets are dicts keyed by ticket id so they keep insertion order and
+    support O(1) add/remove. Writes (create/delete) patch the indexes in place
+    instead of reloading the sprint. ``max_tickets`` caps memory per store;
+    new tickets beyond it are dropped (and counted) rather than stored.
+    """
+
+    def __init__(self, max_tickets: Optional[int] = None):
+        self.max_tickets = max_tickets
+        self.dropped = 0
+        self.sprint_id: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.directory = Directory()
+        self._tickets: Dict[str, Ticket] = {}
+        self._by_assignee: Dict[str, Dict[str, None]] = {}
+        self._by_item_no: Dict[str, str] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def replace_all(self, sprint_id: str, tickets: Iterable[Ticket]):
+        self.clear()
+        self.sprint_id = sprint_id
+        for ticket in tickets:
+            self.upsert(ticket)
+        self.loaded_at = time.monotonic()
+
+    def clear(self):
+        self.sprint_id = None
+        self.loaded_at = None
+        self.dropped = 0
+        self._tickets.clear()
+        self._by_assignee.clear()
+        self._by_item_no.clear()
+        self._by_status.clear()
+
+    def upsert(self, ticket: Ticket):
+        ticket_id = ticket.id
+        if ticket_id in self._tickets:
+            self._unindex(self._tickets[ticket_id])
+        elif self.max_tickets is not None and len(self._tickets) >= self.max_tickets:
+            self.dropped += 1
+            return
+        self._tickets[ticket_id] = ticket
+        for user_id in ticket.assignee_ids:
+            self._by_assignee.setdefault(user_id, {})[ticket_id] = None
+        self._by_item_no[normalize_item_no(ticket.item_no)] = ticket_id
+        self._by_status.setdefault(ticket.status_id, {})[ticket_id] = None
+
+    def remove(self, ticket_id: str) -> Optional[Ticket]:
+        ticket = self._tickets.pop(ticket_id, None)
+        if ticket is not None:
+            self._unindex(ticket)
+        return ticket
+
+    def _unindex(self, ticket: Ticket):
+        ticket_id = ticket.id
+        for user_id in ticket.assignee_ids:
+            _discard(self._by_assignee, user_id, ticket_id)
+        _discard(self._by_status, ticket.status_id, ticket_id)
+        item_no = normalize_item_no(ticket.item_no)
+        if self._by_item_no.get(item_no) == ticket_id:
+            del self._by_item_no[item_no]
+
+    def get(self, ticket_id: str) -> Optional[Ticket]:
+        return self._tickets.get(ticket_id)
+
+    def id_for_item_no(self, item_no: Any) -> Optional[str]:
+        return self._by_item_no.get(normalize_item_no(item_no))
+
+    def for_assignee(self, user_id: str) -> List[Ticket]:
+        return [self._tickets[ticket_id] for ticket_id in self._by_assignee.get(user_id, ())]
+
+    def with_status(self, status_id: str) -> List[Ticket]:
+        return [self._tickets[ticket_id] for ticket_id in self._by_status.get(status_id, ())]
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __iter__(self) -> Iterator[Ticket]:
+        return iter(self._tickets.values())
+
+
+def _discard(index: Dict[Any, Dict[str, None]], key: Any, ticket_id: str):
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.pop(ticket_id, None)
+        if not bucket:
+            del index[key]
@@ -0,0 +1,76 @@
+import asyncio
+import os
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from loguru import logger
+
+from sprint_bot.models import Directory, Ticket
+from sprint_bot.tracing import preview
+from sprint_bot.zoho_client import ZohoAPIError, ZohoClient
+
+# Zoho caps "range" per request, so larger sprints have to be paged
+ZOHO_PAGE_SIZE = int(os.environ.get("ZOHO_PAGE_SIZE", "100"))
+
+
+async def _fetch_page(client: ZohoClient, path: str, index: int, page_size: int, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    response = await client.get(path, params={**(params or {}), "action": "data", "index": index, "range": page_size})
+    if response.status_code != 200:
+        logger.error(f"Failed to fetch tickets page {index}. Status code: {response.status_code}, Response: {preview(response.text)}")
+        raise ZohoAPIError("Failed to fetch tickets.", response.status_code)
+    return response.json()
+
+
+async def iter_ticket_pages(
+    client: ZohoClient,
+    path: str,
+    directory: Directory,
+    page_size: int = ZOHO_PAGE_SIZE,
+    prefetch: bool = True,
+    params: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[List[Ticket]]:
+    """
+    Yield parsed tickets from a Zoho ``item/`` endpoint one page at a time.
+
+    Only the current page's raw payload is alive at any point. With
+    ``prefetch`` the next page is requested while the caller processes the
+    current one. User names from each page are merged into ``directory``,
+    which the parsed tickets resolve display names through. Extra query
+    ``params`` (e.g. a modified-since filter) go on every page request.
+    Raises ZohoAPIError if any page fails, so callers never
+    mistake a partial listing for a complete one.
+    """
+    index = 1
+    pending: Optional[asyncio.Task] = asyncio.create_task(_fetch_page(client, path, index, page_size, params))
+    try:
+        while pending is not None:
+            data = await pending
+            pending = None
+            items = data.get("itemJObj") or {}
+            # Zoho reports "next" on paged listings; fall back to a short page check
+            has_more = bool(items) and bool(data.get("next", len(items) >= page_size))
+            if has_more:
+                index += page_size
+                if prefetch:
+                    pending = asyncio.create_task(_fetch_page(client, path, index, page_size, params))
+
+            directory.update_users(data.get("userDisplayName"))
+            page = [Ticket.from_row(ticket_id, row, directory) for ticket_id, row in items.items()]
+            del data, items
+            if page:
+                yield page
+
+            if has_more and not prefetch:
+                pending = asyncio.create_task(_fetch_page(client, path, index, page_size, params))
+    finally:
+        # The consumer stopped early (or failed); drop the prefetched page
+        if pending is not None:
+            pending.cancel()
+
+
+async def iter_tickets(client: ZohoClient, path: str, directory: Directory, **kwargs) -> AsyncIterator[Ticket]:
+    """Flattened view of iter_ticket_pages."""
+    async with aclosing(iter_ticket_pages(client, path, directory, **kwargs)) as pages:
+        async for page in pages:
+            for ticket in page:
+                yield ticket
@@ -0,0 +1,124 @@
+import os
+import reprlib
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, List, Optional, Tuple
+
+from loguru import logger
+
+from sprint_bot.metrics import metrics
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+# Longest payload preview written to the logs, in characters
+LOG_PAYLOAD_LIMIT = int(os.environ.get("LOG_PAYLOAD_LIMIT", "500"))
+
+LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | "
+    "{extra[trace_id]} | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+
+# reprlib stops walking big containers early, so a preview of a huge Zoho
+# payload costs about the same as one of a small payload
+_payload_repr = reprlib.Repr()
+_payload_repr.maxlevel = 3
+_payload_repr.maxdict = 8
+_payload_repr.maxlist = 8
+_payload_repr.maxstring = 120
+_payload_repr.maxother = 120
+
+
+def preview(payload: Any, limit: int = LOG_PAYLOAD_LIMIT) -> str:
+    """Size-capped repr for logging. Pair with logger.opt(lazy=True) on hot paths."""
+    text = payload if isinstance(payload, str) else _payload_repr.repr(payload)
+    if len(text) > limit:
+        return f"{text[:limit]}... ({len(text)} chars)"
+    return text
+
+
+class Trace:
+    """Span timings for one Slack event or API request."""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or uuid.uuid4().hex[:16]
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, bool]] = []
+        self.finished = False
+
+    def add(self, name: str, seconds: float, ok: bool = True):
+        # Late spans (e.g. a background refresh the request kicked off) are dropped
+        if not self.finished:
+            self.spans.append((name, seconds, ok))
+
+    def finish(self):
+        """Record end-to-end latency and log the span breakdown (once)."""
+        if self.finished:
+            return
+        self.finished = True
+        total = time.perf_counter() - self.started
+        metrics.observe("sprintbot_request_seconds", total)
+        breakdown = " ".join(f"{name}={seconds * 1000:.1f}ms{'' if ok else '!'}" for name, seconds, ok in self.spans)
+        logger.info(f"Trace {self.trace_id} done in {total * 1000:.1f}ms: {breakdown}")
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("sprintbot_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def current_trace_id() -> str:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else "-"
+
+
+@contextmanager
+def use_trace(trace: Optional[Trace]):
+    """Make ``trace`` current for this block and any tasks created inside it."""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str):
+    """
+    Time a leg of the request. The duration goes to the current trace and
+    the sprintbot_span_seconds histogram; an exception also counts towards
+    sprintbot_errors_total before it propagates.
+    """
+    start = time.perf_counter()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        metrics.incr("sprintbot_errors_total", span=name)
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        metrics.observe("sprintbot_span_seconds", seconds, span=name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(name, seconds, ok)
+
+
+def record_error(name: str):
+    # For failures that come back as responses rather than exceptions
+    metrics.incr("sprintbot_errors_total", span=name)
+
+
+def _add_trace_id(record):
+    record["extra"].setdefault("trace_id", current_trace_id())
+
+
+def setup_logging():
+    """Stamp every log line with the current trace id and apply LOG_LEVEL."""
+    logger.remove()
+    logger.configure(patcher=_add_trace_id)
+    logger.add(sys.stderr, level=LOG_LEVEL, format=LOG_FORMAT)
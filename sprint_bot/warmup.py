@@ -0,0 +1,84 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from sprint_bot.tracing import span
+
+# Warm caches and pools before taking traffic (set to 0 to start cold)
+WARMUP_ON_STARTUP = os.environ.get("WARMUP_ON_STARTUP", "1") != "0"
+# Past this the remaining steps are abandoned and the instance reports ready anyway
+WARMUP_TIMEOUT = float(os.environ.get("WARMUP_TIMEOUT", "15"))
+# Also sync the default tenant's ticket store (a full sprint load; slow for big sprints)
+WARMUP_TICKETS = os.environ.get("WARMUP_TICKETS", "0") == "1"
+
+Step = Callable[[], Awaitable[Any]]
+
+
+class Warmup:
+    """
+    Startup phase run from the lifespan: named steps (cache loads, pool
+    opens, lazy imports) run concurrently in the background while the server
+    already answers health checks. ``ready`` flips once every step has
+    finished, failed or timed out; a failed step only makes the state
+    "degraded", since an upstream outage shouldn't keep every instance out of
+    the load balancer.
+    """
+
+    def __init__(self, timeout: float = WARMUP_TIMEOUT):
+        self.timeout = timeout
+        self.state = "cold"
+        self.seconds: Optional[float] = None
+        self._steps: List[Tuple[str, Step]] = []
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, name: str, step: Step):
+        self._steps.append((name, step))
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ("warm", "degraded", "skipped")
+
+    def start(self, enabled: bool = WARMUP_ON_STARTUP):
+        if not enabled or not self._steps:
+            self.state = "skipped"
+            return
+        self.state = "warming"
+        self._task = asyncio.create_task(self._run())
+
+    async def _run_step(self, name: str, step: Step):
+        start = time.perf_counter()
+        try:
+            with span(f"warmup.{name}"):
+                ok = await step() is not False
+            error = None
+        except Exception as e:
+            ok, error = False, repr(e)
+            logger.warning(f"Warm-up step {name} failed: {error}")
+        self._results[name] = {"ok": ok, "seconds": round(time.perf_counter() - start, 3), "error": error}
+
+    async def _run(self):
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(self._run_step(name, step)) for name, step in self._steps]
+        _, pending = await asyncio.wait(tasks, timeout=self.timeout)
+        for task in pending:
+            task.cancel()
+        for name, _ in self._steps:
+            self._results.setdefault(name, {"ok": False, "seconds": self.timeout, "error": "timed out"})
+        self.seconds = round(time.perf_counter() - start, 3)
+        self.state = "warm" if all(result["ok"] for result in self._results.values()) else "degraded"
+        logger.info(f"Warm-up {self.state} in {self.seconds}s: " + ", ".join(f"{name}={result['seconds']}s" for name, result in self._results.items()))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "ready": self.ready, "seconds": self.seconds, "steps": dict(self._results)}
+
+    async def aclose(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,126 @@
+import base64
+import hashlib
+import hmac
+import os
+import sys
+from typing import Any, Dict, Iterable, Optional
+
+from loguru import logger
+
+from sprint_bot.models import Ticket
+from sprint_bot.ticket_store import normalize_item_no
+
+# Header carrying the HMAC-SHA256 of the raw request body (hex or base64)
+ZOHO_WEBHOOK_SIGNATURE_HEADER = os.environ.get("ZOHO_WEBHOOK_SIGNATURE_HEADER", "X-Zoho-Webhook-Signature")
+
+ITEM_UPSERT_EVENTS = {"item.created", "item.updated"}
+ITEM_DELETE_EVENTS = {"item.deleted"}
+SPRINT_EVENTS = {"sprint.started", "sprint.completed", "sprint.updated", "sprint.deleted"}
+# apply_event outcomes that changed the tenant's caches
+APPLIED_OUTCOMES = {"upserted", "removed", "rollover"}
+
+
+def verify_signature(secret: Optional[str], body: bytes, signature: Optional[str]) -> bool:
+    """Constant-time check of ``signature`` against HMAC-SHA256(secret, body)."""
+    if not secret or not signature:
+        return False
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).digest()
+    signature = signature.strip()
+    if signature.startswith("sha256="):
+        signature = signature[len("sha256="):]
+    # Compared as bytes: compare_digest refuses non-ASCII str, and the header is client input
+    received = signature.encode("utf-8", "replace")
+    return hmac.compare_digest(received, digest.hex().encode()) or hmac.compare_digest(received, base64.b64encode(digest))
+
+
+def _intern(value: Any) -> Optional[str]:
+    return sys.intern(str(value)) if value is not None else None
+
+
+def iter_events(payload: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    # One notification, or a batch under "events"
+    if isinstance(payload.get("events"), list):
+        return payload["events"]
+    return [payload]
+
+
+def _ticket_from_item(item: Dict[str, Any], existing: Optional[Ticket], directory) -> Optional[Ticket]:
+    # Fields missing from a partial update keep their current values
+    item_id = item.get("itemId") or (existing.id if existing else None)
+    item_no = item.get("itemNo") or (existing.item_no if existing else None)
+    if not item_id or not item_no:
+        return None
+    assignees = item.get("users")
+    return Ticket(
+        id=_intern(item_id),
+        title=item.get("name", existing.title if existing else ""),
+        item_no=normalize_item_no(item_no),
+        status_id=_intern(item["statusId"]) if "statusId" in item else (existing.status_id if existing else None),
+        created_by_id=_intern(item["createdBy"]) if "createdBy" in item else (existing.created_by_id if existing else None),
+        assignee_ids=tuple(_intern(user_id) for user_id in assignees) if assignees is not None else (existing.assignee_ids if existing else ()),
+        directory=directory,
+    )
+
+
+def apply_event(tenant, event: Dict[str, Any]) -> str:
+    """
+    Apply one change notification to the tenant's caches and return what was
+    done ("upserted", "removed", "rollover" or "ignored").
+
+    Expected shape (all ids as Zoho reports them):
+        {"event": "item.created" | "item.updated" | "item.deleted",
+         "sprintId": "...", "item": {"itemId", "itemNo", "name", "statusId", "createdBy", "users": [...]}}
+        {"event": "sprint.started" | "sprint.completed" | ..., "sprintId": "..."}
+    """
+    kind = event.get("event")
+    store = tenant.ticket_store
+    sprint_sync = tenant.sprint_sync
+
+    if kind in SPRINT_EVENTS:
+        # Rollover: drop the cached sprint (and its users); the next sync sees the
+        # new sprint and reloads the store in full
+        if kind == "sprint.started" and event.get("sprintId"):
+            tenant.reference_cache.set("current_sprint", event["sprintId"])
+        else:
+            tenant.invalidate_reference_data("current_sprint")
+        sprint_sync.mark_stale()
+        return "rollover"
+
+    item = event.get("item")
+    if not isinstance(item, dict):
+        item = {}
+    item_id = item.get("itemId") or event.get("itemId")
+    if not store.loaded or not item_id:
+        # Nothing cached to patch yet; the first sync will pick it up
+        return "ignored"
+
+    if kind in ITEM_DELETE_EVENTS:
+        return "removed" if store.remove(item_id) is not None else "ignored"
+
+    if kind in ITEM_UPSERT_EVENTS:
+        sprint_id = event.get("sprintId") or item.get("sprintId")
+        if sprint_id and sprint_id != store.sprint_id:
+            # Moved out of (or created outside) the sprint we serve
+            return "removed" if store.remove(item_id) is not None else "ignored"
+        ticket = _ticket_from_item({**item, "itemId": item_id}, store.get(item_id), store.directory)
+        if ticket is None:
+            # Too little to index; let the next read resync
+            sprint_sync.mark_stale()
+            return "ignored"
+        store.upsert(ticket)
+        return "upserted"
+
+    logger.warning(f"[{tenant.name}] Ignoring unknown Zoho webhook event {kind!r}")
+    return "ignored"
+
+
+def apply_events(tenant, payload: Dict[str, Any]) -> Dict[str, int]:
+    outcomes: Dict[str, int] = {}
+    for event in iter_events(payload):
+        outcome = apply_event(tenant, event)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    # Only a payload that actually changed the caches counts as a push; an
+    # all-ignored batch must not hold off the polling sync
+    if any(outcome in APPLIED_OUTCOMES for outcome in outcomes):
+        tenant.sprint_sync.record_push()
+    return outcomes
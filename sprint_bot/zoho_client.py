@@ -0,0 +1,149 @@
+import asyncio
+import os
+import re
+from typing import Any, Dict, Optional
+
+import httpx
+from loguru import logger
+
+from sprint_bot.resilience import ResiliencePolicy, UpstreamUnavailable
+from sprint_bot.tracing import record_error, span
+
+ZOHO_ACCESS_TOKEN = os.environ.get("ZOHO_ACCESS_TOKEN")
+ZOHO_API_BASE_URL = os.environ.get("ZOHO_API_BASE_URL", "https://sprintsapi.zoho.com/zsapi")
+
+# Pool / timeout defaults, overridable from the environment
+ZOHO_TIMEOUT = float(os.environ.get("ZOHO_TIMEOUT", "10"))
+ZOHO_CONNECT_TIMEOUT = float(os.environ.get("ZOHO_CONNECT_TIMEOUT", "3"))
+ZOHO_MAX_CONNECTIONS = int(os.environ.get("ZOHO_MAX_CONNECTIONS", "20"))
+ZOHO_MAX_KEEPALIVE = int(os.environ.get("ZOHO_MAX_KEEPALIVE", "10"))
+ZOHO_MAX_CONCURRENCY = int(os.environ.get("ZOHO_MAX_CONCURRENCY", "10"))
+
+# Safe to send again after a failure (and, for GET, to hedge)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+# Path segments holding ids (team, project, sprint, item), so every sprint or
+# item shares one breaker per endpoint. Each tenant has its own policy, so one
+# team's errors or 429s (its own quota) never open another team's circuits
+_ID_SEGMENT = re.compile(r"/[^/]*\d[^/]*(?=/|$)")
+
+
+def endpoint_key(method: str, path: str) -> str:
+    return f"{method} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+def _is_failure(response: httpx.Response) -> bool:
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def _not_sent(error: Exception) -> bool:
+    # Nothing reached Zoho, so even a POST can be retried without creating a duplicate
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+
+class ZohoAPIError(Exception):
+    """Raised when Zoho answers with a non-success status mid-operation."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ZohoClient:
+    """
+    Async client for the Zoho Sprints API.
+
+    All calls share one keep-alive connection pool, carry a per-call timeout and
+    go through a semaphore so a burst of Slack events can't fan out into an
+    unbounded number of in-flight Zoho requests. Calls also go through
+    ``policy`` (see sprint_bot.resilience): per-endpoint circuit breakers,
+    jittered retries for idempotent methods and hedged GETs. 5xx/429
+    responses come back after the last attempt as before; an open circuit or
+    a transport error that survives the retries raises ZohoAPIError.
+    """
+
+    def __init__(
+        self,
+        base_url: str = ZOHO_API_BASE_URL,
+        access_token: Optional[str] = ZOHO_ACCESS_TOKEN,
+        timeout: float = ZOHO_TIMEOUT,
+        max_connections: int = ZOHO_MAX_CONNECTIONS,
+        max_keepalive: int = ZOHO_MAX_KEEPALIVE,
+        max_concurrency: int = ZOHO_MAX_CONCURRENCY,
+        policy: Optional[ResiliencePolicy] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.access_token = access_token
+        self.timeout = timeout
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.policy = policy or ResiliencePolicy("zoho")
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily so the pool is bound to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout, connect=ZOHO_CONNECT_TIMEOUT),
+                limits=self._limits,
+            )
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        auth_scheme: str = "Bearer",
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        headers = {"Authorization": f"{auth_scheme} {self.access_token}"}
+
+        async def attempt() -> httpx.Response:
+            async with self._semaphore:
+                logger.debug(f"Zoho {method} {path}")
+                return await self._get_client().request(
+                    method,
+                    path,
+                    params=params,
+                    data=data,
+                    headers=headers,
+                    timeout=timeout if timeout is not None else self.timeout,
+                )
+
+        idempotent = method in IDEMPOTENT_METHODS
+        with span("zoho"):
+            try:
+                response = await self.policy.call(
+                    endpoint_key(method, path),
+                    attempt,
+                    retry=idempotent,
+                    hedge=method == "GET",
+                    is_failure=_is_failure,
+                    is_error=lambda error: isinstance(error, httpx.TransportError),
+                    retry_error=None if idempotent else _not_sent,
+                )
+            except UpstreamUnavailable as e:
+                raise ZohoAPIError(str(e)) from e
+        if response.status_code >= 400:
+            record_error("zoho")
+        return response
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, params=params, **kwargs)
+
+    async def post(self, path: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, data=data, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", path, **kwargs)
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
@@ -0,0 +1,20 @@
+from sprint_bot.helpers import BOT_CAPABILITIES_MESSAGE, chunk_lines
+
+
+def test_more_note_fits_in_the_last_chunk():
+    lines = [("To Do", "• " + "x" * 98) for _ in range(200)]
+    chunks = chunk_lines(lines, "*🎟️ Your Tickets:*", limit=3500, max_chunks=2)
+    assert len(chunks) == 2
+    assert all(len(chunk) <= 3500 for chunk in chunks)
+    shown = sum(chunk.count("• ") for chunk in chunks)
+    assert chunks[-1].endswith(f"_…and {200 - shown} more not shown._")
+
+
+def test_no_note_when_everything_fits():
+    chunks = chunk_lines([("To Do", "• a"), ("Done", "• b")], "*H*", limit=100)
+    assert chunks == ["*H*\n\n*To Do*\n• a\n\n*Done*\n• b"]
+
+
+def test_capabilities_list_requirements():
+    assert "   - _Requirements_: You must specify the ticket ID (e.g., I2378)." in BOT_CAPABILITIES_MESSAGE
+    assert BOT_CAPABILITIES_MESSAGE.count("_Requirements_") == BOT_CAPABILITIES_MESSAGE.count("_How to use_")
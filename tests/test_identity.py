@@ -0,0 +1,36 @@
+import asyncio
+
+from sprint_bot.identity import IdentityIndex, NameIndex
+
+
+def _index():
+    index = NameIndex()
+    index.update({"1": "Bob Jones", "2": "Alice Smithers", "3": "Sam Lee", "4": "Sam  Lee"})
+    return index
+
+
+def test_exact_match_ignores_case_and_accents():
+    assert _index().exact("bob jones") == "1"
+    assert _index().exact("Álice Smithers") == "2"
+
+
+def test_exact_match_rejects_near_misses():
+    index = _index()
+    assert index.exact("Rob Jones") is None
+    assert index.exact("Al Smith") is None
+
+
+def test_exact_match_rejects_ties():
+    assert _index().exact("sam lee") is None
+
+
+def test_workers_sharing_the_file_keep_each_others_links(tmp_path):
+    path = str(tmp_path / "identities.json")
+    first, second = IdentityIndex(path), IdentityIndex(path)
+    asyncio.run(first.link("team", "U1", "Z1"))
+    asyncio.run(second.link("team", "U2", "Z2"))
+    assert IdentityIndex(path).get("team", "U1") == "Z1"
+    assert IdentityIndex(path).get("team", "U2") == "Z2"
+    # The writer also picks up links learned elsewhere
+    assert second.get("team", "U1") == "Z1"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["identities.json"]
@@ -0,0 +1,24 @@
+from sprint_bot.intent_cache import IntentCache
+
+
+def test_quoted_assignee_is_not_replayed():
+    cache = IntentCache()
+    cache.store('please file "fix login" and give it to "alice"',
+                {"intent": "create_ticket", "title": "fix login", "assignee": "alice"})
+    found, result = cache.lookup('please file "write docs" and give it to "bob"')
+    assert found
+    assert result == {"intent": "create_ticket", "title": "write docs", "assignee": "bob"}
+
+
+def test_unquoted_assignee_is_part_of_the_key():
+    cache = IntentCache()
+    cache.store('create "fix login" and assign it to alice',
+                {"intent": "create_ticket", "title": "fix login", "assignee": "alice"})
+    assert cache.lookup('create "write docs" and assign it to alice')[1]["assignee"] == "alice"
+    assert cache.lookup('create "write docs" and assign it to bob') == (False, None)
+
+
+def test_untraceable_entity_field_is_not_cached():
+    cache = IntentCache()
+    cache.store('rename "a" to "b"', {"intent": "rename_ticket", "title": "a", "new_title": "b"})
+    assert cache.lookup('rename "c" to "d"') == (False, None)
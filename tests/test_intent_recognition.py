@@ -0,0 +1,89 @@
+import pytest
+
+from sprint_bot.intent_recognition import BULK_MAX_ITEMS, classify_locally, count_ticket_ids, extract_ticket_ids
+
+
+@pytest.mark.parametrize("query", [
+    "delete i100, it's a duplicate of i99",
+    "delete ticket i12 because i13 replaces it",
+    "remove ticket i2378 from the 2023-2024 roadmap",
+])
+def test_delete_with_extra_ids_goes_to_llm(query):
+    assert classify_locally(query) is None
+
+
+@pytest.mark.parametrize("query, ticket_ids", [
+    ("delete tickets i1, i2 and i3", ["I1", "I2", "I3"]),
+    ("Delete tickets I101, I102 and I107", ["I101", "I102", "I107"]),
+    ("Remove tickets I40 to I42", ["I40", "I41", "I42"]),
+    ("delete i5-i7", ["I5", "I6", "I7"]),
+])
+def test_bulk_delete_list(query, ticket_ids):
+    assert classify_locally(query) == {"intent": "bulk_delete_tickets", "ticket_ids": ticket_ids}
+
+
+def test_single_delete_stays_local():
+    assert classify_locally("delete ticket i2378") == {"intent": "delete_ticket", "ticket_id": "I2378"}
+
+
+def test_unprefixed_numbers_are_not_a_range():
+    assert extract_ticket_ids("remove i2378 from the 2023-2024 roadmap") == ["I2378"]
+
+
+@pytest.mark.parametrize("query", [
+    "don't delete i2378",
+    "should i delete i2378?",
+    "how do i delete ticket i2378?",
+    "never remove i55",
+])
+def test_delete_that_isnt_a_command_goes_to_llm(query):
+    assert classify_locally(query) is None
+
+
+@pytest.mark.parametrize("query, ticket_id", [
+    ("Remove ticket with ID I2312", "I2312"),
+    ("Delete the ticket I1212", "I1212"),
+    ("please delete i5.", "I5"),
+])
+def test_delete_command_stays_local(query, ticket_id):
+    assert classify_locally(query) == {"intent": "delete_ticket", "ticket_id": ticket_id}
+
+
+@pytest.mark.parametrize("query, title", [
+    ('create a ticket "don\'t crash"', "don't crash"),
+    ("create a ticket 'don't crash'", "don't crash"),
+    ("Create a ticket for 'Improve performance'", "Improve performance"),
+])
+def test_apostrophes_dont_split_titles(query, title):
+    assert classify_locally(query) == {"intent": "create_ticket", "title": title}
+
+
+def test_apostrophe_without_quoted_title_goes_to_llm():
+    assert classify_locally("create a ticket for bob's login bug") is None
+
+
+@pytest.mark.parametrize("query", [
+    'create tickets for bob\'s team "fix login" and "write docs"',
+    'create tickets for "a" and "b" please',
+    "new tickets:\n1. fix it\n2. ship it\nthanks, and cc carol",
+    'create tickets "a" and "b" for bob\nfor alice',
+])
+def test_unclear_bulk_create_goes_to_llm(query):
+    assert classify_locally(query) is None
+
+
+@pytest.mark.parametrize("query, expected", [
+    ('Create tickets "Set up CI", "Write docs" and "Add metrics" for Bob',
+     {"titles": ["Set up CI", "Write docs", "Add metrics"], "assignee": "Bob"}),
+    ("new tickets:\n1. fix it\n2. ship it\nfor alice", {"titles": ["fix it", "ship it"], "assignee": "alice"}),
+    ("add tickets:\n- fix bob's login\n- write docs", {"titles": ["fix bob's login", "write docs"]}),
+])
+def test_bulk_create(query, expected):
+    assert classify_locally(query) == {"intent": "bulk_create_tickets", **expected}
+
+
+def test_oversized_range_reports_its_real_size():
+    result = classify_locally("delete tickets i1 to i2000")
+    assert len(result["ticket_ids"]) == BULK_MAX_ITEMS + 1
+    assert result["ticket_count"] == 2000
+    assert count_ticket_ids("delete i1-i10, i5 to i12 and i3") == 12
@@ -0,0 +1,207 @@
+import asyncio
+
+import httpx
+import pytest
+
+from sprint_bot import resilience
+from sprint_bot.reference_cache import ReferenceCache
+from sprint_bot.resilience import CircuitBreaker, ResiliencePolicy, UpstreamUnavailable
+from sprint_bot.sync_engine import SprintSync
+from sprint_bot.ticket_store import TicketStore
+from sprint_bot.zoho_client import ZohoClient
+
+
+class Flaky(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt: 0)
+
+
+def _policy(**kwargs):
+    kwargs = {"failure_threshold": 3, "reset_timeout": 60, "max_attempts": 3, "hedge_delay": 0, **kwargs}
+    return ResiliencePolicy("test", **kwargs)
+
+
+def _failing(calls):
+    async def attempt():
+        calls.append(1)
+        raise Flaky()
+    return attempt
+
+
+def test_breaker_opens_at_the_threshold():
+    breaker = CircuitBreaker("b", failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    assert breaker.times_opened == 1
+
+
+def test_half_open_lets_exactly_one_trial_through():
+    breaker = CircuitBreaker("b", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_cancelled_trial_releases_the_breaker():
+    policy = _policy(failure_threshold=1, reset_timeout=0)
+    breaker = policy.breaker("GET /x")
+    breaker.record_failure()
+
+    async def main():
+        task = asyncio.create_task(policy.call("GET /x", lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        assert not breaker.allow()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert breaker.allow()
+
+
+def test_non_idempotent_call_is_not_retried():
+    calls = []
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(_policy().call("POST /x", _failing(calls), retry=False, retry_error=lambda error: False))
+    assert len(calls) == 1
+
+
+def test_non_idempotent_call_retries_when_retry_error_allows():
+    calls = []
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(_policy().call("POST /x", _failing(calls), retry=False, retry_error=lambda error: True))
+    assert len(calls) == 3
+
+
+def test_failed_results_are_returned_after_the_last_attempt():
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        return 503
+
+    assert asyncio.run(_policy().call("GET /x", attempt, is_failure=lambda status: status >= 500)) == 503
+    assert len(calls) == 3
+
+
+def test_deadline_stops_retries():
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        raise Flaky()
+
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(_policy(max_attempts=10, deadline=0.3).call("GET /x", attempt))
+    assert len(calls) == 2
+
+
+def test_hedge_win_cancels_the_slow_copy():
+    policy = _policy(hedge_delay=0.01)
+
+    async def main():
+        cancelled = asyncio.Event()
+        started = []
+
+        async def attempt():
+            started.append(1)
+            if len(started) == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+                return "slow"
+            return "fast"
+
+        assert await policy.call("GET /x", attempt, hedge=True) == "fast"
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+    asyncio.run(main())
+    assert (policy.hedges, policy.hedge_wins) == (1, 1)
+
+
+def test_open_circuit_fails_fast():
+    policy = _policy(failure_threshold=1, max_attempts=1)
+    calls = []
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(policy.call("GET /x", _failing(calls)))
+    with pytest.raises(UpstreamUnavailable, match="circuit open"):
+        asyncio.run(policy.call("GET /x", _failing(calls)))
+    assert len(calls) == 1
+    assert policy.short_circuited == 1
+
+
+def test_reference_cache_serves_last_good_value_while_circuit_is_open():
+    policy = _policy(failure_threshold=1, max_attempts=1)
+    up = True
+
+    async def load_sprint():
+        async def attempt():
+            if not up:
+                raise Flaky()
+            return "S1"
+        return await policy.call("GET /sprints", attempt)
+
+    async def main():
+        nonlocal up
+        cache = ReferenceCache()
+        cache.register("current_sprint", load_sprint, ttl=0)
+        assert await cache.get("current_sprint") == "S1"
+        up = False
+        assert await cache.get("current_sprint") == "S1"
+        assert policy.is_open("GET /sprints")
+        assert await cache.get("current_sprint") == "S1"
+        assert cache.stale_served == 2
+
+    asyncio.run(main())
+    assert policy.short_circuited == 1
+
+
+def test_sprint_sync_serves_last_snapshot_while_circuit_is_open():
+    policy = _policy(failure_threshold=1, max_attempts=1)
+    requests = []
+    up = True
+    row = ["Fix login", "7", "U1"] + [None] * 29
+
+    def handler(request):
+        requests.append(request)
+        if not up:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"itemJObj": {"T1": row}, "userDisplayName": {"U1": "Ann"}, "next": False})
+
+    async def sprint_id():
+        return "S1"
+
+    async def statuses():
+        return {}
+
+    async def main():
+        nonlocal up
+        client = ZohoClient(base_url="https://zoho.test", access_token="t", policy=policy)
+        client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+        sync = SprintSync(client, TicketStore(), sprint_id, statuses, lambda sprint: f"/sprints/{sprint}/item/")
+        await sync.sync()
+        assert len(sync.store) == 1
+        up = False
+        for _ in range(2):
+            sync.mark_stale()
+            assert len(await sync.ensure_fresh()) == 1
+        await client.aclose()
+        return sync
+
+    sync = asyncio.run(main())
+    # Two requests before the failure opened the circuit, none after
+    assert len(requests) == 2
+    assert (sync.failures, sync.stale_served, policy.short_circuited) == (2, 2, 1)
@@ -0,0 +1,25 @@
+import asyncio
+
+import httpx
+
+from sprint_bot.slack_client import SlackSender
+
+
+def _sender(responses):
+    sender = SlackSender(base_url="https://slack.test/api", token="t", max_attempts=2, ack_delay=0)
+    replies = iter(responses)
+    sender._client = httpx.AsyncClient(base_url=sender.base_url, transport=httpx.MockTransport(lambda request: next(replies)))
+    return sender
+
+
+def test_non_json_reply_is_retried_not_raised():
+    html = httpx.Response(200, text="<html>502 Bad Gateway</html>", headers={"Content-Type": "text/html"})
+    sender = _sender([html, httpx.Response(200, json={"ok": True})])
+    assert asyncio.run(sender.send("C1", "hi"))
+    assert (sender.retries, sender.sent) == (1, 1)
+
+
+def test_non_json_replies_fail_the_send():
+    sender = _sender([httpx.Response(200, text="<html></html>"), httpx.Response(403, text="denied")])
+    assert not asyncio.run(sender.send("C1", "hi"))
+    assert sender.failed == 1
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from sprint_bot import sync_engine
+from sprint_bot.models import Ticket
+from sprint_bot.sync_engine import NO_ACTIVE_SPRINT, ZOHO_MODIFIED_SINCE_PARAM, SprintSync
+from sprint_bot.ticket_store import TicketStore
+from sprint_bot.zoho_client import ZohoAPIError
+
+
+class FakeZoho:
+    """Stands in for the paged item listing that iter_tickets reads."""
+
+    def __init__(self, count):
+        self.items = {f"T{n}": f"ticket {n}" for n in range(count)}
+        self.modified = set()
+        self.ignore_filter = False
+        self.fail = False
+        self.requests = []
+
+    async def iter_tickets(self, client, path, directory, params=None):
+        self.requests.append(params)
+        if self.fail:
+            raise ZohoAPIError("Zoho is down")
+        delta = params is not None and not self.ignore_filter
+        for item_id, title in self.items.items():
+            if delta and item_id not in self.modified:
+                continue
+            yield Ticket(item_id, title, item_id[1:], None, None, (), directory)
+
+
+@pytest.fixture
+def zoho(monkeypatch):
+    fake = FakeZoho(100)
+    monkeypatch.setattr(sync_engine, "iter_tickets", fake.iter_tickets)
+    return fake
+
+
+def _sync(sprint_id="S1", **kwargs):
+    async def get_sprint_id():
+        return sprint_id
+
+    async def get_statuses():
+        return {}
+
+    return SprintSync(None, TicketStore(), get_sprint_id, get_statuses, lambda sprint: f"/sprints/{sprint}/item/", **kwargs)
+
+
+def test_first_sync_is_full_then_delta(zoho):
+    sync = _sync()
+    asyncio.run(sync.sync())
+    assert (sync.full_syncs, sync.delta_syncs, len(sync.store)) == (1, 0, 100)
+    first_watermark = sync.watermark_ms
+
+    zoho.modified = {"T3"}
+    zoho.items["T3"] = "renamed"
+    asyncio.run(sync.sync())
+    assert (sync.full_syncs, sync.delta_syncs, sync.items_merged) == (1, 1, 1)
+    assert sync.store.get("T3").title == "renamed"
+    assert zoho.requests[-1] == {ZOHO_MODIFIED_SINCE_PARAM: first_watermark}
+    assert sync.watermark_ms >= first_watermark
+
+
+def test_full_sync_when_forced_or_sprint_rolls_over(zoho):
+    sync = _sync()
+    asyncio.run(sync.sync())
+    asyncio.run(sync.sync(full=True))
+    assert sync.full_syncs == 2
+    sync.full_interval = 0
+    asyncio.run(sync.sync())
+    assert (sync.full_syncs, sync.delta_syncs) == (3, 0)
+
+    async def next_sprint():
+        return "S2"
+
+    sync.full_interval = 900
+    sync.get_sprint_id = next_sprint
+    asyncio.run(sync.sync())
+    assert (sync.full_syncs, sync.store.sprint_id) == (4, "S2")
+
+
+def test_ignored_delta_filter_falls_back_to_full_syncs(zoho):
+    sync = _sync(interval=30, full_interval=900)
+    asyncio.run(sync.sync())
+    zoho.ignore_filter = True
+    asyncio.run(sync.sync())
+    assert sync.delta_unsupported
+    assert sync.poll_interval() == 900
+    asyncio.run(sync.sync())
+    assert (sync.full_syncs, sync.delta_syncs) == (2, 1)
+
+
+def test_failed_sync_serves_the_last_good_snapshot(zoho):
+    sync = _sync()
+    asyncio.run(sync.sync())
+    zoho.fail = True
+    sync.mark_stale()
+    store = asyncio.run(sync.ensure_fresh())
+    assert len(store) == 100
+    assert (sync.failures, sync.stale_served) == (1, 1)
+
+
+def test_failed_first_sync_raises(zoho):
+    zoho.fail = True
+    sync = _sync()
+    with pytest.raises(ZohoAPIError):
+        asyncio.run(sync.ensure_fresh())
+
+
+def test_failed_sprint_lookup_is_not_an_empty_sprint(zoho):
+    sync = _sync(sprint_id=None)
+    with pytest.raises(ZohoAPIError):
+        asyncio.run(sync.sync())
+    assert not sync.store.loaded
+
+    sync = _sync(sprint_id=NO_ACTIVE_SPRINT)
+    asyncio.run(sync.sync())
+    assert sync.store.loaded and len(sync.store) == 0
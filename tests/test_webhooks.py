@@ -0,0 +1,20 @@
+import base64
+import hashlib
+import hmac
+
+from sprint_bot.webhooks import verify_signature
+
+
+def _digest(body: bytes) -> bytes:
+    return hmac.new(b"secret", body, hashlib.sha256).digest()
+
+
+def test_hex_and_base64_signatures():
+    digest = _digest(b"{}")
+    assert verify_signature("secret", b"{}", digest.hex())
+    assert verify_signature("secret", b"{}", "sha256=" + base64.b64encode(digest).decode())
+    assert not verify_signature("secret", b"{ }", digest.hex())
+
+
+def test_non_ascii_signature_is_rejected_not_raised():
+    assert not verify_signature("secret", b"{}", "café")